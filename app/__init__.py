@@ -3,23 +3,79 @@ Video Download API Application Factory
 """
 
 from flask import Flask, jsonify
+from sqlalchemy import event
+from werkzeug.middleware.proxy_fix import ProxyFix
 from app.config import Config
-from app.routes.video_routes import video_bp
+from app.routes.video_routes import video_bp, cache_service, extraction_backend, video_service
+from app.routes.job_routes import job_bp, job_service, process_job_item
 from app.utils.logger import setup_logger
-from app.db import db
+from app.utils.codec import FastJSONProvider
+from app.db import db, upgrade_schema
 
-def create_app(config_class=Config):
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Let several worker processes share the SQLite cache database"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA busy_timeout=5000')
+    cursor.close()
+
+def start_background_services(app):
+    """
+    Start the background threads of the current process
+    
+    Threads do not survive fork, so pre-forking servers call this in
+    every worker instead of letting create_app start them in the master.
+    
+    Args:
+        app: Flask application
+    """
+    # Write cached results from a background thread
+    cache_service.start_writer(app)
+    
+    # Start background workers for asynchronous jobs
+    job_service.start_workers(app, app.config['JOB_WORKERS'], process_job_item)
+    
+    # yt-dlp is imported on first use; load it now without delaying startup
+    if app.config['WARM_ON_START'] and not video_service.warmed:
+        video_service.warm_in_background()
+
+def stop_background_services(timeout: float = 10.0):
+    """
+    Stop the background work of the current process
+    
+    Job workers finish their current item, pending cache writes are
+    flushed and extraction worker processes are stopped.
+    
+    Args:
+        timeout: Seconds to wait for job workers and cache writes
+    """
+    job_service.stop(timeout)
+    if cache_service.writer is not None:
+        cache_service.writer.close(timeout)
+    if extraction_backend is not None:
+        extraction_backend.close()
+
+def create_app(config_class=Config, start_services: bool = True):
     """
     Create a Flask application with the appropriate configuration
     
     Args:
         config_class: Configuration class
+        start_services: Whether to start background threads now (see
+            start_background_services)
         
     Returns:
         Flask: Configured Flask application
     """
     app = Flask(__name__)
     app.config.from_object(config_class)
+    app.json = FastJSONProvider(app)
+    
+    # Take the client address and scheme from the trusted reverse proxies
+    hops = app.config['PROXY_FIX_HOPS']
+    if hops > 0:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
     
     # Initialize database
     db.init_app(app)
@@ -29,6 +85,18 @@ def create_app(config_class=Config):
     
     # Register blueprints
     app.register_blueprint(video_bp, url_prefix='/api/v1')
+    app.register_blueprint(job_bp, url_prefix='/api/v1')
+    
+    # Create database tables
+    with app.app_context():
+        if db.engine.dialect.name == 'sqlite':
+            event.listen(db.engine, 'connect', _set_sqlite_pragmas)
+        db.create_all()
+        for change in upgrade_schema():
+            logger.warning(f"Database schema upgraded: {change}")
+    
+    if start_services:
+        start_background_services(app)
     
     # Add health check route
     @app.route('/health')
@@ -52,7 +120,9 @@ def create_app(config_class=Config):
                 'get_download_links': '/api/v1/get-download-links',
                 'get_info': '/api/v1/get-info',
                 'get_subtitles': '/api/v1/get-subtitles',
-                'get_thumbnails': '/api/v1/get-thumbnails'
+                'get_thumbnails': '/api/v1/get-thumbnails',
+                'create_job': '/api/v1/jobs',
+                'get_job': '/api/v1/jobs/<job_id>'
             },
             'documentation': {
                 'example_request': {
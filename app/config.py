@@ -17,7 +17,7 @@ class Config:
     
     # JSON settings
     JSON_SORT_KEYS = False
-    JSONIFY_PRETTYPRINT_REGULAR = True
+    JSONIFY_PRETTYPRINT_REGULAR = False
     
     # yt-dlp settings
     YT_DLP_OPTIONS = {
@@ -40,6 +40,10 @@ class Config:
         'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
     }
     
+    # yt-dlp instance pool settings
+    YDL_POOL_MAX_IDLE = int(os.environ.get('YDL_POOL_MAX_IDLE', '8'))  # Idle instances kept per option set
+    YDL_POOL_MAX_USES = int(os.environ.get('YDL_POOL_MAX_USES', '50'))  # Extractions before an instance is recycled
+    
     # Supported formats
     SUPPORTED_FORMATS = [
         'best', 'worst', 'bestvideo', 'worstvideo', 'bestaudio', 'worstaudio',
@@ -48,9 +52,67 @@ class Config:
         'mp3', 'aac', 'ogg', 'wav', 'flac', 'm4a'
     ]
     
+    # Extraction backend settings: 'thread' runs yt-dlp in the request thread,
+    # 'process' in a pool of worker processes
+    EXTRACTION_BACKEND = os.environ.get('EXTRACTION_BACKEND', 'thread')
+    PROCESS_WORKERS = int(os.environ.get('PROCESS_WORKERS', str(os.cpu_count() or 2)))
+    PROCESS_WORKER_MAX_JOBS = int(os.environ.get('PROCESS_WORKER_MAX_JOBS', '100'))
+    PROCESS_WORKER_MAX_RSS_MB = int(os.environ.get('PROCESS_WORKER_MAX_RSS_MB', '1024'))
+    WARM_ON_START = os.environ.get('WARM_ON_START', 'true').lower() == 'true'  # Load yt-dlp in the background at startup
+    
     # Limit settings
     MAX_PLAYLIST_SIZE = 50
-    REQUEST_TIMEOUT = 60
+    REQUEST_TIMEOUT = float(os.environ.get('REQUEST_TIMEOUT', '60'))  # Extraction deadline in seconds; 0 disables
+    BATCH_WORKERS = int(os.environ.get('BATCH_WORKERS', '16'))  # Shared pool for all batch requests
+    BATCH_CONCURRENCY = int(os.environ.get('BATCH_CONCURRENCY', '4'))  # Default per-request parallelism
+    BATCH_MAX_CONCURRENCY = int(os.environ.get('BATCH_MAX_CONCURRENCY', '8'))
+    BATCH_URL_TIMEOUT = float(os.environ.get('BATCH_URL_TIMEOUT', '60'))
+    
+    # Adaptive per-site concurrency settings (AIMD on latency and throttling)
+    ADAPTIVE_CONCURRENCY_ENABLED = os.environ.get('ADAPTIVE_CONCURRENCY_ENABLED', 'true').lower() == 'true'
+    ADAPTIVE_CONCURRENCY_INITIAL = int(os.environ.get('ADAPTIVE_CONCURRENCY_INITIAL', '4'))
+    ADAPTIVE_CONCURRENCY_MIN = int(os.environ.get('ADAPTIVE_CONCURRENCY_MIN', '1'))
+    ADAPTIVE_CONCURRENCY_MAX = int(os.environ.get('ADAPTIVE_CONCURRENCY_MAX', '32'))
+    ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE = float(os.environ.get('ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE', '3.0'))
+    ADAPTIVE_CONCURRENCY_WAIT = float(os.environ.get('ADAPTIVE_CONCURRENCY_WAIT', '60'))  # Seconds to wait for a slot
+    
+    # Circuit breaker settings, per extractor
+    CIRCUIT_BREAKER_ENABLED = os.environ.get('CIRCUIT_BREAKER_ENABLED', 'true').lower() == 'true'
+    CIRCUIT_BREAKER_FAILURE_RATE = float(os.environ.get('CIRCUIT_BREAKER_FAILURE_RATE', '0.5'))
+    CIRCUIT_BREAKER_WINDOW = int(os.environ.get('CIRCUIT_BREAKER_WINDOW', '20'))  # Recent extractions considered
+    CIRCUIT_BREAKER_MIN_CALLS = int(os.environ.get('CIRCUIT_BREAKER_MIN_CALLS', '5'))
+    CIRCUIT_BREAKER_OPEN_SECONDS = float(os.environ.get('CIRCUIT_BREAKER_OPEN_SECONDS', '30'))
+    CIRCUIT_BREAKER_PROBES = int(os.environ.get('CIRCUIT_BREAKER_PROBES', '1'))  # Trial extractions while half-open
+    
+    # Cache settings
+    CACHE_DEFAULT_TTL = int(os.environ.get('CACHE_DEFAULT_TTL', '21600'))  # Used when a result has no signed URLs
+    CACHE_PERMANENT_FAILURE_TTL = int(os.environ.get('CACHE_PERMANENT_FAILURE_TTL', '3600'))  # Unavailable, removed, ...
+    CACHE_TRANSIENT_FAILURE_TTL = int(os.environ.get('CACHE_TRANSIENT_FAILURE_TTL', '30'))  # Network, throttling, ...; 0 disables
+    CACHE_EXPIRY_MARGIN = int(os.environ.get('CACHE_EXPIRY_MARGIN', '300'))  # Treat entries as expired this early
+    MEMORY_CACHE_MAX_BYTES = int(os.environ.get('MEMORY_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+    CACHE_CODEC = os.environ.get('CACHE_CODEC', 'zlib')  # 'json', 'zlib' or 'zstd' (needs zstandard)
+    RESPONSE_CACHE_MAX_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))  # Serialized responses
+    FORMAT_INDEX_MAX_BYTES = int(os.environ.get('FORMAT_INDEX_MAX_BYTES', str(16 * 1024 * 1024)))  # Indexed format lists
+    CACHE_REFRESH_AHEAD = int(os.environ.get('CACHE_REFRESH_AHEAD', '600'))  # Refresh hot entries this early; 0 disables
+    CACHE_REFRESH_MIN_HITS = int(os.environ.get('CACHE_REFRESH_MIN_HITS', '3'))  # Hits that make an entry hot
+    CACHE_REFRESH_WORKERS = int(os.environ.get('CACHE_REFRESH_WORKERS', '2'))  # Background refresh threads
+    
+    # Write-behind settings for cache writes
+    WRITE_BEHIND_ENABLED = os.environ.get('WRITE_BEHIND_ENABLED', 'true').lower() == 'true'
+    WRITE_BEHIND_BATCH_SIZE = int(os.environ.get('WRITE_BEHIND_BATCH_SIZE', '100'))
+    WRITE_BEHIND_MAX_DELAY = float(os.environ.get('WRITE_BEHIND_MAX_DELAY', '0.5'))  # Seconds
+    WRITE_BEHIND_MAX_PENDING = int(os.environ.get('WRITE_BEHIND_MAX_PENDING', '10000'))
+    
+    # Request coalescing settings
+    SINGLE_FLIGHT_DISTRIBUTED = os.environ.get('SINGLE_FLIGHT_DISTRIBUTED', 'false').lower() == 'true'
+    SINGLE_FLIGHT_LOCK_TTL = int(os.environ.get('SINGLE_FLIGHT_LOCK_TTL', '120'))
+    SINGLE_FLIGHT_POLL_INTERVAL = float(os.environ.get('SINGLE_FLIGHT_POLL_INTERVAL', '0.25'))
+    
+    # Asynchronous job settings
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '2'))  # Worker threads per process
+    JOB_LEASE_SECONDS = int(os.environ.get('JOB_LEASE_SECONDS', '300'))  # Claimed items are retried after this
+    JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', '3'))
+    JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', '1.0'))
     
     # Logger settings
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
@@ -61,6 +123,9 @@ class Config:
     RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'false').lower() == 'true'
     RATE_LIMIT_REQUESTS = int(os.environ.get('RATE_LIMIT_REQUESTS', '10'))
     RATE_LIMIT_WINDOW = int(os.environ.get('RATE_LIMIT_WINDOW', '60'))
+    RATE_LIMIT_SHARED = os.environ.get('RATE_LIMIT_SHARED', 'false').lower() == 'true'  # Share buckets across processes via the DB
+    RATE_LIMIT_MAX_CLIENTS = int(os.environ.get('RATE_LIMIT_MAX_CLIENTS', '100000'))  # Hard cap, LRU eviction
+    PROXY_FIX_HOPS = int(os.environ.get('PROXY_FIX_HOPS', '0'))  # Trusted reverse proxies setting X-Forwarded-For
 
 class DevelopmentConfig(Config):
     """
@@ -1,8 +1,16 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import case, insert, inspect, text, tuple_, update
+from sqlalchemy.exc import IntegrityError
 import json
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
+from typing import Any, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+from app.config import Config
+from app.utils.codec import encode_payload, decode_payload
 
 db = SQLAlchemy()
+config = Config()
 
 class RequestLog(db.Model):
     """Model for storing request logs"""
@@ -13,6 +21,293 @@ class RequestLog(db.Model):
     duration = db.Column(db.Float, nullable=False)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
 
+class CacheEntry(db.Model):
+    """Model for cached extraction results, one row per (cache_key, format)
+    
+    Videos with a known extractor and id are stored once in CachedVideo
+    and referenced from the payload as {"$video": <video_key>}.
+    """
+    __tablename__ = 'cache_entry'
+    __table_args__ = (
+        db.UniqueConstraint('cache_key', 'format', name='uq_cache_entry_key_format'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    cache_key = db.Column(db.String, nullable=False)
+    format = db.Column(db.String, nullable=False)
+    codec = db.Column(db.String(8), nullable=False)
+    payload = db.Column(db.LargeBinary, nullable=False)
+    raw_size = db.Column(db.Integer, nullable=False)  # Uncompressed size of the full result
+    duration = db.Column(db.Float, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+class CachedVideo(db.Model):
+    """Model for cached videos shared by playlist and single-video entries"""
+    __tablename__ = 'cached_video'
+    __table_args__ = (
+        db.UniqueConstraint('video_key', 'format', name='uq_cached_video_key_format'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    video_key = db.Column(db.String, nullable=False)
+    format = db.Column(db.String, nullable=False)
+    codec = db.Column(db.String(8), nullable=False)
+    payload = db.Column(db.LargeBinary, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+class ExtractionLock(db.Model):
+    """Model for cross-process extraction locks, one row per in-flight key"""
+    __tablename__ = 'extraction_lock'
+    key = db.Column(db.String, primary_key=True)
+    owner = db.Column(db.String, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+class RateLimitBucket(db.Model):
+    """Model for token buckets shared by all processes, one row per client"""
+    __tablename__ = 'rate_limit_bucket'
+    client = db.Column(db.String, primary_key=True)
+    tokens = db.Column(db.Float, nullable=False)
+    updated_at = db.Column(db.Float, nullable=False)  # Unix time of the last refill
+
+class Job(db.Model):
+    """Model for asynchronous extraction jobs"""
+    __tablename__ = 'job'
+    id = db.Column(db.String(32), primary_key=True)
+    kind = db.Column(db.String, nullable=False)
+    format = db.Column(db.String, nullable=False)
+    flat = db.Column(db.Boolean, nullable=False, default=False)
+    fields = db.Column(db.String)  # Comma-separated sparse fieldset, None for all fields
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    items = db.relationship('JobItem', backref='job', order_by='JobItem.index', lazy='select')
+
+class JobItem(db.Model):
+    """Model for the URLs of a job; each one is claimed and processed separately"""
+    __tablename__ = 'job_item'
+    __table_args__ = (
+        db.Index('ix_job_item_status_id', 'status', 'id'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.String(32), db.ForeignKey('job.id'), nullable=False, index=True)
+    index = db.Column(db.Integer, nullable=False)
+    url = db.Column(db.String, nullable=False)
+    status = db.Column(db.String, nullable=False, default='queued')  # queued, running, done, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    claimed_by = db.Column(db.String)
+    lease_expires_at = db.Column(db.DateTime)
+    result = db.Column(db.Text)  # Store as JSON string
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+def upgrade_schema() -> List[str]:
+    """Bring tables created by earlier versions up to date
+    
+    db.create_all() only creates missing tables. Before results were
+    stored compressed, cache_entry held a JSON `result` column instead of
+    codec/payload/raw_size; the table only holds a cache, so it is
+    rebuilt empty rather than converted. Jobs created before sparse
+    fieldsets lack the nullable `fields` column, which is added. Run
+    after db.create_all().
+    
+    Returns:
+        List: Descriptions of the changes made
+    """
+    changes = []
+    columns = {column['name'] for column in inspect(db.engine).get_columns(CacheEntry.__tablename__)}
+    if 'payload' not in columns:
+        CacheEntry.__table__.drop(db.engine)
+        CacheEntry.__table__.create(db.engine)
+        changes.append('rebuilt cache_entry in the compressed payload format')
+    
+    columns = {column['name'] for column in inspect(db.engine).get_columns(Job.__tablename__)}
+    if 'fields' not in columns:
+        with db.engine.begin() as connection:
+            connection.execute(text(f'ALTER TABLE {Job.__tablename__} ADD COLUMN fields VARCHAR'))
+        changes.append('added job.fields')
+    return changes
+
+def _iter_result_urls(data: Any) -> Iterator[str]:
+    """Yield every 'url' string found in a (nested) result structure"""
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if key == 'url' and isinstance(value, str):
+                yield value
+            elif isinstance(value, (dict, list)):
+                yield from _iter_result_urls(value)
+    elif isinstance(data, list):
+        for item in data:
+            yield from _iter_result_urls(item)
+
+def _parse_url_expiry(url: str) -> Optional[int]:
+    """Read the unix 'expire' timestamp from a signed media URL
+    
+    Handles both the query form (``...&expire=1700000000&...``) and the
+    path form used by manifest URLs (``.../expire/1700000000/...``).
+    
+    Args:
+        url: Media URL
+        
+    Returns:
+        int: Expiry timestamp if present, else None
+    """
+    if 'expire' not in url:
+        return None
+    parsed = urlparse(url)
+    values = parse_qs(parsed.query).get('expire')
+    if not values:
+        segments = parsed.path.split('/')
+        if 'expire' in segments:
+            index = segments.index('expire')
+            values = segments[index + 1:index + 2]
+    try:
+        return int(values[0]) if values else None
+    except ValueError:
+        return None
+
+def get_result_ttl(result: dict) -> int:
+    """Get the lifetime of a result that has no signed URLs
+    
+    Failures are cached for CACHE_PERMANENT_FAILURE_TTL when they concern
+    the requested content and will not change on a retry, and for
+    CACHE_TRANSIENT_FAILURE_TTL otherwise (including failures from before
+    errors were classified). Playlists cut at their deadline count as
+    transient failures. Extractions rejected by a circuit breaker or a
+    concurrency limit say nothing about the URL and are not cached.
+    
+    Args:
+        result: The result data or error
+        
+    Returns:
+        int: Lifetime in seconds
+    """
+    if result.get('rejected'):
+        return 0
+    if result.get('success', True) and not result.get('partial'):
+        return config.CACHE_DEFAULT_TTL
+    if result.get('partial') or result.get('retryable', True):
+        return config.CACHE_TRANSIENT_FAILURE_TTL
+    return config.CACHE_PERMANENT_FAILURE_TTL
+
+def get_result_expiry(result: dict) -> datetime:
+    """Compute when a result stops being servable
+    
+    The earliest 'expire' parameter of the signed URLs inside the result
+    wins, since one dead link makes the whole entry stale. Results without
+    signed URLs live for get_result_ttl() seconds; CACHE_EXPIRY_MARGIN is
+    added back because it only protects signed URLs.
+    
+    Args:
+        result: The result data or error
+        
+    Returns:
+        datetime: Naive UTC expiry time
+    """
+    if result.get('partial'):
+        # A partial playlist should be completed soon, not served for hours
+        return datetime.utcnow() + timedelta(seconds=get_result_ttl(result) + config.CACHE_EXPIRY_MARGIN)
+    expiries = [e for e in map(_parse_url_expiry, _iter_result_urls(result)) if e]
+    if expiries:
+        return datetime.utcfromtimestamp(min(expiries))
+    return datetime.utcnow() + timedelta(seconds=get_result_ttl(result) + config.CACHE_EXPIRY_MARGIN)
+
+def _video_key(video: Any) -> Optional[str]:
+    """Get the storage key of a fully extracted video, or None if it cannot be shared"""
+    if not isinstance(video, dict) or video.get('resolved') is False:
+        return None
+    extractor_key, video_id = video.get('extractor_key'), video.get('id')
+    if not extractor_key or not video_id or video_id == 'unknown':
+        return None
+    return f"{extractor_key}:{video_id}"
+
+def _split_result(result: dict) -> Tuple[dict, dict]:
+    """Replace shareable videos in a result with references
+    
+    Args:
+        result: The result data or error
+        
+    Returns:
+        Tuple: (result with references, {video_key: video})
+    """
+    videos = {}
+    
+    def reference(video):
+        key = _video_key(video)
+        if key is None:
+            return video
+        videos[key] = video
+        return {'$video': key}
+    
+    if not result.get('success'):
+        return result, videos
+    if result.get('is_playlist') and isinstance(result.get('playlist'), dict):
+        playlist = dict(result['playlist'])
+        playlist['videos'] = [reference(video) for video in playlist.get('videos', [])]
+        return {**result, 'playlist': playlist}, videos
+    if 'video' in result:
+        return {**result, 'video': reference(result['video'])}, videos
+    return result, videos
+
+def _join_result(result: dict, videos: dict) -> Optional[dict]:
+    """Resolve the references of a stored result, or None if a video is missing"""
+    def resolve(video):
+        if isinstance(video, dict) and '$video' in video:
+            return videos.get(video['$video'])
+        return video
+    
+    if result.get('is_playlist') and isinstance(result.get('playlist'), dict):
+        resolved = [resolve(video) for video in result['playlist'].get('videos', [])]
+        if any(video is None for video in resolved):
+            return None
+        result['playlist']['videos'] = resolved
+    elif 'video' in result:
+        result['video'] = resolve(result['video'])
+        if result['video'] is None:
+            return None
+    return result
+
+def get_stored_entry(url: str, format: str, max_stale: float = 0.0) -> Optional[Tuple[dict, datetime, int]]:
+    """Retrieve a stored result together with its expiry and size
+    
+    Entries whose signed URLs expire within CACHE_EXPIRY_MARGIN seconds
+    (less max_stale) are treated as misses, as are entries whose shared
+    videos are gone.
+    
+    Args:
+        url: The URL of the request
+        format: The requested format
+        max_stale: Seconds of the margin the caller is willing to give up
+        
+    Returns:
+        Tuple: (result, expires_at, uncompressed size in bytes) if found, else None
+    """
+    fresh_until = datetime.utcnow() + timedelta(seconds=config.CACHE_EXPIRY_MARGIN - max_stale)
+    entry = CacheEntry.query.filter(
+        CacheEntry.cache_key == url,
+        CacheEntry.format == format,
+        CacheEntry.expires_at > fresh_until
+    ).first()
+    if not entry:
+        return None
+    
+    result = decode_payload(entry.codec, entry.payload)
+    refs = set()
+    if result.get('is_playlist') and isinstance(result.get('playlist'), dict):
+        refs = {video['$video'] for video in result['playlist'].get('videos', []) if '$video' in video}
+    elif isinstance(result.get('video'), dict) and '$video' in result['video']:
+        refs = {result['video']['$video']}
+    
+    videos = {}
+    if refs:
+        rows = CachedVideo.query.filter(
+            CachedVideo.video_key.in_(refs),
+            CachedVideo.format == format,
+            CachedVideo.expires_at > fresh_until
+        ).all()
+        videos = {row.video_key: decode_payload(row.codec, row.payload) for row in rows}
+    
+    result = _join_result(result, videos)
+    if result is None:
+        return None
+    return result, entry.expires_at, entry.raw_size
+
 def get_stored_result(url: str, format: str) -> dict:
     """Retrieve stored result for a given URL and format
     
@@ -23,24 +318,193 @@ def get_stored_result(url: str, format: str) -> dict:
     Returns:
         dict: Stored result if found, else None
     """
-    log = RequestLog.query.filter_by(url=url, format=format).first()
-    if log:
-        return json.loads(log.result)
-    return None
+    stored = get_stored_entry(url, format)
+    return stored[0] if stored else None
+
+def _summarize_result(result: dict) -> str:
+    """Build the request log summary of a result"""
+    summary = {'success': result.get('success', False)}
+    if 'error' in result:
+        summary['error'] = result['error']
+    return json.dumps(summary)
+
+def _upsert_rows(model, key_columns: Tuple[str, str], rows: dict):
+    """Bulk update existing rows of model and bulk insert the rest
+    
+    Args:
+        model: CacheEntry or CachedVideo
+        key_columns: Names of the two unique key columns
+        rows: {(key, format): column values}
+    """
+    first, second = (getattr(model, name) for name in key_columns)
+    existing = db.session.query(model.id, first, second).filter(tuple_(first, second).in_(list(rows))).all()
+    existing_ids = {(key, format): row_id for row_id, key, format in existing}
+    updates = [{'id': existing_ids[pair], **row} for pair, row in rows.items() if pair in existing_ids]
+    inserts = [row for pair, row in rows.items() if pair not in existing_ids]
+    if updates:
+        db.session.execute(update(model), updates)
+    if inserts:
+        db.session.execute(insert(model), inserts)
+
+def add_request_logs(records: List[Tuple[str, str, dict, float]]) -> List[datetime]:
+    """Add request logs and refresh their cache entries in one transaction
+    
+    Payloads are compressed with CACHE_CODEC. Videos that can be shared
+    are written to the video table once per batch, whatever number of
+    entries reference them. Within a batch, the last record for a
+    (url, format) pair wins.
+    
+    Args:
+        records: (url, format, result, duration) tuples
+        
+    Returns:
+        List: Expiry time stored for each record
+    """
+    now = datetime.utcnow()
+    logs = []
+    entries = {}
+    videos = {}
+    expiries = []
+    for url, format, result, duration in records:
+        try:
+            raw_size = len(json.dumps(result, separators=(',', ':')))
+        except TypeError:
+            result = {"success": False, "error": "Result is not serializable"}
+            raw_size = len(json.dumps(result))
+        expires_at = get_result_expiry(result)
+        stored_result, shared_videos = _split_result(result)
+        
+        for video_key, video in shared_videos.items():
+            codec, payload = encode_payload(video, config.CACHE_CODEC)
+            videos[(video_key, format)] = {
+                'video_key': video_key,
+                'format': format,
+                'codec': codec,
+                'payload': payload,
+                'created_at': now,
+                'expires_at': get_result_expiry(video)
+            }
+        
+        codec, payload = encode_payload(stored_result, config.CACHE_CODEC)
+        logs.append({'url': url, 'format': format, 'result': _summarize_result(result), 'duration': duration, 'timestamp': now})
+        entries[(url, format)] = {
+            'cache_key': url,
+            'format': format,
+            'codec': codec,
+            'payload': payload,
+            'raw_size': raw_size,
+            'duration': duration,
+            'created_at': now,
+            'expires_at': expires_at
+        }
+        expiries.append(expires_at)
+    if not logs:
+        return expiries
+    
+    for attempt in range(2):
+        try:
+            db.session.execute(insert(RequestLog), logs)
+            if videos:
+                _upsert_rows(CachedVideo, ('video_key', 'format'), videos)
+            _upsert_rows(CacheEntry, ('cache_key', 'format'), entries)
+            db.session.commit()
+            break
+        except IntegrityError:
+            # A concurrent writer inserted one of the pairs; retry so it becomes an update
+            db.session.rollback()
+            if attempt:
+                raise
+    return expiries
 
-def add_request_log(url: str, format: str, result: dict, duration: float):
-    """Add a new request log to the database
+def add_request_log(url: str, format: str, result: dict, duration: float) -> datetime:
+    """Add a new request log to the database and refresh the cache entry
+    
+    The full payload is stored once, in the cache table; the request log
+    only keeps the outcome.
     
     Args:
         url: The URL of the request
         format: The requested format
         result: The result data or error
         duration: The processing duration in seconds
+        
+    Returns:
+        datetime: Expiry time stored with the cache entry
+    """
+    return add_request_logs([(url, format, result, duration)])[0]
+
+def acquire_extraction_lock(key: str, owner: str, ttl: int) -> bool:
+    """Try to take the extraction lock for a key
+    
+    Locks left behind by crashed holders are reclaimed once expired.
+    
+    Args:
+        key: Lock key
+        owner: Identity of the caller
+        ttl: Lock lifetime in seconds
+        
+    Returns:
+        bool: True if the lock is now held by owner
     """
+    now = datetime.utcnow()
+    ExtractionLock.query.filter(ExtractionLock.key == key, ExtractionLock.expires_at <= now).delete()
+    db.session.add(ExtractionLock(key=key, owner=owner, expires_at=now + timedelta(seconds=ttl)))
     try:
-        result_json = json.dumps(result)
-    except TypeError:
-        result_json = json.dumps({"error": "Result is not serializable"})
-    log = RequestLog(url=url, format=format, result=result_json, duration=duration)
-    db.session.add(log)
-    db.session.commit()
\ No newline at end of file
+        db.session.commit()
+        return True
+    except IntegrityError:
+        db.session.rollback()
+        return False
+
+def release_extraction_lock(key: str, owner: str):
+    """Release an extraction lock if it is still held by owner
+    
+    Args:
+        key: Lock key
+        owner: Identity of the caller
+    """
+    ExtractionLock.query.filter_by(key=key, owner=owner).delete()
+    db.session.commit()
+
+def take_rate_limit_token(client: str, capacity: float, rate: float) -> float:
+    """Take a token from a client's shared bucket
+    
+    The refill and the decrement happen in one conditional UPDATE, so
+    concurrent processes cannot spend the same token twice.
+    
+    Args:
+        client: Client identifier
+        capacity: Bucket size
+        rate: Tokens added per second
+        
+    Returns:
+        float: 0.0 if a token was taken, else seconds until one is available
+    """
+    for _ in range(2):
+        now = time.time()
+        refilled = RateLimitBucket.tokens + (now - RateLimitBucket.updated_at) * rate
+        refilled = case((refilled > capacity, capacity), else_=refilled)
+        taken = db.session.execute(
+            update(RateLimitBucket)
+            .where(RateLimitBucket.client == client, refilled >= 1)
+            .values(tokens=refilled - 1, updated_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if taken:
+            db.session.commit()
+            return 0.0
+        
+        bucket = db.session.get(RateLimitBucket, client)
+        if bucket is not None:
+            tokens = min(capacity, bucket.tokens + (now - bucket.updated_at) * rate)
+            db.session.rollback()
+            return max(0.0, 1 - tokens) / rate
+        
+        db.session.add(RateLimitBucket(client=client, tokens=capacity - 1, updated_at=now))
+        try:
+            db.session.commit()
+            return 0.0
+        except IntegrityError:
+            # Another process created the bucket first; take from it instead
+            db.session.rollback()
+    return 0.0
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""
+API routes for asynchronous extraction jobs
+"""
+
+import time
+from flask import Blueprint, request, jsonify
+from typing import Dict, Any, List, Optional
+from app.config import Config
+from app.services.job_service import JobService
+from app.routes.video_routes import (validate_request_data, get_video_info_with_cache, _extract_and_store,
+                                     video_service, enforce_rate_limit)
+from app.utils.logger import setup_logger, log_request, log_error
+
+# Create Blueprint
+job_bp = Blueprint('jobs', __name__)
+job_bp.before_request(enforce_rate_limit)
+
+# Set up services
+job_service = JobService()
+logger = setup_logger('job_routes')
+config = Config()
+
+JOB_TYPES = ['info', 'download-links']
+
+# Seconds of an item's lease kept free to store its result after the extraction
+LEASE_MARGIN = 10
+
+def process_job_item(kind: str, url: str, format: str, flat: bool, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Process one URL of a job from its cached canonical extraction
+    
+    Jobs are not bound by REQUEST_TIMEOUT: a miss is extracted with a
+    deadline just short of the item's lease. A cached partial result is
+    extracted again with that deadline instead of being reused.
+    
+    Args:
+        kind: Job type
+        url: Video or playlist URL
+        format: Requested format
+        flat: Whether playlist entries are returned unresolved
+        fields: Optional sparse fieldset of the videos
+        
+    Returns:
+        Dict: Result for the URL
+    """
+    deadline = time.time() + max(1, config.JOB_LEASE_SECONDS - LEASE_MARGIN)
+    info = get_video_info_with_cache(url, flat=flat, deadline=deadline)
+    if info.get('partial'):
+        info = _extract_and_store(url, flat, deadline=deadline)
+    return video_service.project(info, kind, format, fields)
+
+@job_bp.route('/jobs', methods=['POST'])
+def create_job():
+    """
+    Enqueue an extraction job
+    
+    Expected JSON (same fields as /get-info, plus an optional type):
+    {
+        "urls": ["url1", "url2", ...],
+        "format": "best",  // optional
+        "type": "info",  // optional, "info" or "download-links"
+        "fields": ["title", "selected_format"]  // optional, video fields to return
+    }
+    """
+    try:
+        log_request(logger, request.method, request.url, request.headers.get('User-Agent'))
+        
+        if not request.is_json:
+            return jsonify({'success': False, 'error': 'Content-Type must be application/json'}), 400
+        
+        validation = validate_request_data(request.json)
+        if not validation['valid']:
+            return jsonify({'success': False, 'error': validation['error']}), 400
+        
+        kind = request.json.get('type', 'info')
+        if kind not in JOB_TYPES:
+            return jsonify({'success': False, 'error': f'Unsupported job type. Supported types: {", ".join(JOB_TYPES)}'}), 400
+        
+        job = job_service.create_job(kind, validation['urls'], validation['format'], validation['flat'],
+                                     validation['fields'])
+        response = jsonify({'success': True, 'job': job})
+        response.headers['Location'] = f"{request.script_root}/api/v1/jobs/{job['id']}"
+        return response, 202
+        
+    except Exception as e:
+        log_error(logger, e, 'Error in create_job')
+        return jsonify({
+            'success': False,
+            'error': 'Internal server error',
+            'message': 'An unexpected error occurred while processing your request'
+        }), 500
+
+@job_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id: str):
+    """
+    Get job progress and the results finished so far
+    """
+    try:
+        job = job_service.get_job(job_id)
+        if job is None:
+            return jsonify({'success': False, 'error': 'Job not found'}), 404
+        return jsonify({'success': True, 'job': job}), 200
+        
+    except Exception as e:
+        log_error(logger, e, 'Error in get_job')
+        return jsonify({
+            'success': False,
+            'error': 'Internal server error',
+            'message': 'An unexpected error occurred while processing your request'
+        }), 500
\ No newline at end of file
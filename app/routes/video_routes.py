@@ -2,22 +2,69 @@
 API routes for video information extraction
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
+import hashlib
+import json
+import math
 import time
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
 from app.services.video_service import VideoService
+from app.services.process_backend import ProcessExtractionBackend
 from app.utils.logger import setup_logger, log_request, log_error
 from app.config import Config
-from app.db import get_stored_result, add_request_log
-import yt_dlp
+from app.services.cache_service import CacheService
+from app.services.rate_limit_service import RateLimitService
+from app.utils.url_normalizer import normalize_url
+from app.utils.batch_executor import BatchExecutor
+from app.utils.codec import dumps
 
 # Create Blueprint
 video_bp = Blueprint('video', __name__)
 
 # Set up services
-video_service = VideoService()
 logger = setup_logger('video_routes')
 config = Config()
+extraction_backend = None
+if config.EXTRACTION_BACKEND == 'process':
+    extraction_backend = ProcessExtractionBackend(
+        config.PROCESS_WORKERS, config.PROCESS_WORKER_MAX_JOBS, config.PROCESS_WORKER_MAX_RSS_MB
+    )
+video_service = VideoService(extraction_backend)
+cache_service = CacheService()
+batch_executor = BatchExecutor(config.BATCH_WORKERS)
+rate_limit_service = RateLimitService()
+
+# Endpoints that are never rate limited: cheap reads that trigger no extraction
+RATE_LIMIT_EXEMPT = {'video.health_check', 'jobs.get_job'}
+
+def enforce_rate_limit():
+    """
+    Reject the request with 429 if its client is over the rate limit
+    
+    Registered as a before_request hook of the API blueprints. Clients are
+    identified by request.remote_addr, which is the address forwarded by
+    the reverse proxy when PROXY_FIX_HOPS is set.
+    
+    Returns:
+        Response: 429 response, or None to continue handling the request
+    """
+    if not config.RATE_LIMIT_ENABLED or request.endpoint in RATE_LIMIT_EXEMPT:
+        return None
+    retry_after = rate_limit_service.check(request.remote_addr or 'unknown')
+    if not retry_after:
+        return None
+    
+    seconds = max(1, math.ceil(retry_after))
+    response = jsonify({
+        'success': False,
+        'error': 'Rate limit exceeded',
+        'retry_after': seconds
+    })
+    response.status_code = 429
+    response.headers['Retry-After'] = str(seconds)
+    return response
+
+video_bp.before_request(enforce_rate_limit)
 
 def validate_request_data(data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -39,11 +86,36 @@ def validate_request_data(data: Dict[str, Any]) -> Dict[str, Any]:
     if format_selector not in config.SUPPORTED_FORMATS:
         return {'valid': False, 'error': f'Unsupported format. Supported formats: {", ".join(config.SUPPORTED_FORMATS)}'}
     
+    concurrency = data.get('concurrency', config.BATCH_CONCURRENCY)
+    if not isinstance(concurrency, int) or isinstance(concurrency, bool) or concurrency < 1:
+        return {'valid': False, 'error': 'Concurrency must be a positive integer'}
+    concurrency = min(concurrency, config.BATCH_MAX_CONCURRENCY)
+    
+    flat = data.get('flat', False)
+    if not isinstance(flat, bool):
+        return {'valid': False, 'error': 'Flat must be a boolean'}
+    
+    max_age = data.get('max_age', 0)
+    if not isinstance(max_age, (int, float)) or isinstance(max_age, bool) or max_age < 0:
+        return {'valid': False, 'error': 'Max age must be a non-negative number of seconds'}
+    
+    fields = data.get('fields')
+    if isinstance(fields, str):
+        fields = [name.strip() for name in fields.split(',') if name.strip()]
+    if fields is not None:
+        if not isinstance(fields, list) or not all(isinstance(name, str) for name in fields):
+            return {'valid': False, 'error': 'Fields must be a list of strings or a comma-separated string'}
+        unknown = [name for name in fields if name not in video_service.VIDEO_FIELDS]
+        if unknown:
+            return {'valid': False,
+                    'error': f'Unknown fields: {", ".join(unknown)}. Available fields: {", ".join(video_service.VIDEO_FIELDS)}'}
+    
     if 'url' in data:
         url = data['url']
         if not isinstance(url, str) or not url.strip():
             return {'valid': False, 'error': 'URL must be a valid string'}
-        return {'valid': True, 'urls': [url.strip()], 'format': format_selector}
+        return {'valid': True, 'urls': [url.strip()], 'format': format_selector, 'concurrency': concurrency,
+                'flat': flat, 'fields': fields, 'max_age': max_age}
     
     elif 'urls' in data:
         urls = data['urls']
@@ -52,48 +124,343 @@ def validate_request_data(data: Dict[str, Any]) -> Dict[str, Any]:
         valid_urls = [u.strip() for u in urls if u.strip()]
         if not valid_urls:
             return {'valid': False, 'error': 'No valid URLs provided'}
-        return {'valid': True, 'urls': valid_urls, 'format': format_selector}
+        return {'valid': True, 'urls': valid_urls, 'format': format_selector, 'concurrency': concurrency,
+                'flat': flat, 'fields': fields, 'max_age': max_age}
     
     return {'valid': False, 'error': 'Invalid request data'}
 
-def get_video_info_with_cache(url: str, format: str, enable_subtitles: bool = False) -> Dict[str, Any]:
+def _cache_identity(url: str, flat: bool = False) -> Tuple[str, str]:
     """
-    Get video info with caching
+    Get the cache key and cache format of a URL's canonical extraction
     
     Args:
         url: Video URL
-        format: Requested format
-        enable_subtitles: Whether to enable subtitle extraction
+        flat: Whether playlist entries are returned unresolved
         
     Returns:
-        Dict: Video information
+        Tuple: (cache key, cache format)
     """
-    stored_result = get_stored_result(url, format)
-    if stored_result:
-        logger.info(f"Retrieved cached result for URL: {url}, format: {format}")
-        return stored_result
+    return normalize_url(url).key, 'canonical+flat' if flat else 'canonical'
+
+def _extract_and_store(url: str, flat: bool, keep_on_error: bool = False,
+                       deadline: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Run the canonical extraction of a URL and store its result
     
+    Args:
+        url: Video URL
+        flat: Whether to return playlist entries unresolved
+        keep_on_error: Leave the cached result in place when the extraction
+            fails transiently (stale-if-error), as background refreshes do
+        deadline: Absolute time the extraction must end by (defaults to REQUEST_TIMEOUT from now)
+        
+    Returns:
+        Dict: Video information
+    """
+    cache_key, cache_format = _cache_identity(url, flat)
     start_time = time.time()
-    result = video_service.get_video_info(url, format, enable_subtitles)
+    result = video_service.get_video_info(url, None, enable_subtitles=True, flat_playlist=flat, deadline=deadline)
     duration = time.time() - start_time
-    add_request_log(url, format, result, duration)
-    logger.info(f"Processed new request for URL: {url}, format: {format}, duration: {duration:.2f}s")
+    transient = result.get('partial') or (not result.get('success') and result.get('retryable', True))
+    if keep_on_error and transient:
+        logger.warning(f"Refresh of {url} failed, keeping the cached result: {result.get('error', 'partial result')}")
+        return result
+    cache_service.set(cache_key, cache_format, result, duration)
+    logger.info(f"Processed new request for URL: {url}, format: {cache_format}, duration: {duration:.2f}s")
     return result
 
+def _refresher(url: str, flat: bool) -> Callable[[], Dict[str, Any]]:
+    """
+    Build the background refresh function of a URL's cached extraction
+    
+    Args:
+        url: Video URL
+        flat: Whether to return playlist entries unresolved
+        
+    Returns:
+        Callable: Function re-extracting and storing the result in an app context
+    """
+    app = current_app._get_current_object()
+    
+    def refresh() -> Dict[str, Any]:
+        with app.app_context():
+            return _extract_and_store(url, flat, keep_on_error=True)
+    
+    return refresh
+
+def get_video_info_with_cache(url: str, flat: bool = False, max_age: float = 0,
+                              deadline: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Get the canonical extraction of a URL with caching
+    
+    The canonical extraction includes formats, subtitles and thumbnails
+    and does not depend on the requested format, so every endpoint and
+    format selector is served from it with VideoService.project.
+    
+    Args:
+        url: Video URL
+        flat: Whether to return playlist entries unresolved
+        max_age: Seconds past its freshness limit a cached result is still accepted
+        deadline: Absolute time an extraction on a miss must end by (defaults to REQUEST_TIMEOUT from now)
+        
+    Returns:
+        Dict: Video information
+    """
+    cache_key, cache_format = _cache_identity(url, flat)
+    stored_result = cache_service.get(cache_key, cache_format, max_age, _refresher(url, flat))
+    if stored_result:
+        logger.info(f"Retrieved cached result for URL: {url} ({cache_key}), format: {cache_format}")
+        return stored_result
+    
+    return cache_service.coalesce(cache_key, cache_format, lambda: _extract_and_store(url, flat, deadline=deadline))
+
+def iter_video_info_with_cache(url: str, flat: bool = False, max_age: float = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Stream canonical extraction events, replaying the cached result when there is one
+    
+    Concurrent misses for the same URL share one extraction: the first
+    request streams it and the others replay its result.
+    
+    Args:
+        url: Video URL
+        flat: Whether to return playlist entries unresolved
+        max_age: Seconds past its freshness limit a cached result is still accepted
+        
+    Yields:
+        Dict: Extraction events (see VideoService.iter_video_info)
+    """
+    cache_key, cache_format = _cache_identity(url, flat)
+    stored_result = cache_service.get(cache_key, cache_format, max_age, _refresher(url, flat))
+    if stored_result:
+        logger.info(f"Retrieved cached result for URL: {url} ({cache_key}), format: {cache_format}")
+        yield from video_service.iter_result_events(stored_result)
+        return
+    
+    def extract() -> Iterator[Dict[str, Any]]:
+        # Time only the extraction, not the client reading the stream
+        duration = 0.0
+        events = video_service.iter_video_info(url, None, enable_subtitles=True, flat_playlist=flat)
+        try:
+            while True:
+                start_time = time.time()
+                event = next(events, None)
+                duration += time.time() - start_time
+                if event is None:
+                    return
+                if event['type'] == 'end':
+                    cache_service.set(cache_key, cache_format, event['result'], duration)
+                    logger.info(f"Processed new streamed request for URL: {url}, format: {cache_format}, "
+                                f"duration: {duration:.2f}s")
+                yield event
+        finally:
+            events.close()
+    
+    yield from cache_service.coalesce_stream(cache_key, cache_format, extract, video_service.iter_result_events)
+
+def wants_ndjson() -> bool:
+    """
+    Check whether the client asked for a streamed NDJSON response
+    
+    Returns:
+        bool: True if application/x-ndjson is preferred over application/json
+    """
+    accept = request.accept_mimetypes
+    return accept['application/x-ndjson'] > accept['application/json']
+
+def ndjson_response(lines: Iterator[Dict[str, Any]], context: str) -> Response:
+    """
+    Stream dicts as newline-delimited JSON
+    
+    Args:
+        lines: Objects to send, one per line
+        context: Log context for errors raised while streaming
+        
+    Returns:
+        Response: Streaming response
+    """
+    def generate() -> Iterator[str]:
+        try:
+            for line in lines:
+                yield json.dumps(line) + '\n'
+        except Exception as e:
+            log_error(logger, e, context)
+            yield json.dumps({
+                'type': 'error',
+                'success': False,
+                'error': 'Internal server error',
+                'message': 'An unexpected error occurred while processing your request'
+            }) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+def url_response(url: str, view: str, format: Optional[str], flat: bool,
+                 fields: Optional[List[str]], max_age: float = 0) -> Response:
+    """
+    Build the response of a single-URL request from stored bytes
+    
+    The projected result is serialized once per (result, endpoint,
+    format, fields) and reused; only the "url" member is spliced in per
+    request. The response carries a strong ETag, and a matching
+    If-None-Match is answered with 304.
+    
+    Args:
+        url: Video or playlist URL
+        view: Projection ('info', 'download-links', 'subtitles' or 'thumbnails')
+        format: Requested format, or None for endpoints without format selection
+        flat: Whether to return playlist entries unresolved
+        fields: Optional sparse fieldset of the videos
+        max_age: Seconds past its freshness limit a cached result is still accepted
+        
+    Returns:
+        Response: JSON response
+    """
+    cache_key, cache_format = _cache_identity(url, flat)
+    variant = f"{view}|{format}|{','.join(fields) if fields is not None else '*'}"
+    cached = cache_service.get_response(cache_key, cache_format, variant, max_age, _refresher(url, flat))
+    if cached is None:
+        info = get_video_info_with_cache(url, flat, max_age)
+        cached = cache_service.set_response(cache_key, cache_format, variant, info,
+                                            video_service.project(info, view, format, fields))
+    
+    encoded_url = dumps(url)
+    etag = hashlib.blake2b(cached.digest + encoded_url, digest_size=16).hexdigest()
+    status = 200 if cached.success else 400
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        body = b'{"url":' + encoded_url + (b',' + cached.body[1:] if len(cached.body) > 2 else b'}')
+        response = Response(body + b'\n', status=status, mimetype='application/json')
+    response.set_etag(etag)
+    return response
+
+def stream_url_events(url: str, format: str, flat: bool, view: str,
+                      fields: Optional[List[str]] = None, max_age: float = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Build the NDJSON lines of a single-URL request
+    
+    A playlist produces a 'playlist' header line, one 'video' line per
+    entry as soon as it is resolved, and an 'end' line; a video produces
+    a 'video' line and an 'end' line.
+    
+    Args:
+        url: Video or playlist URL
+        format: Requested format, selected locally for each video
+        flat: Whether to return playlist entries unresolved
+        view: Projection of the videos ('info' or 'download-links')
+        fields: Optional sparse fieldset of the videos
+        max_age: Seconds past its freshness limit a cached result is still accepted
+        
+    Yields:
+        Dict: NDJSON lines
+    """
+    is_playlist = False
+    if fields is not None:
+        fields = set(fields)
+    for event in iter_video_info_with_cache(url, flat, max_age):
+        if event['type'] == 'playlist':
+            is_playlist = True
+            playlist = {k: v for k, v in event['playlist'].items() if k != 'total_videos'}
+            if view != 'info':
+                playlist = {'title': playlist['title'], 'playlist_count': playlist['playlist_count']}
+            yield {'type': 'playlist', 'url': url, 'playlist': playlist}
+        
+        elif event['type'] == 'video':
+            video = video_service.project_video(event['video'], view, is_playlist, format, fields)
+            yield {'type': 'video', 'url': url, 'index': event['index'], 'video': video}
+        
+        elif event['type'] == 'end':
+            result = event['result']
+            line = {'type': 'end', 'url': url, 'success': result['success']}
+            if result['success']:
+                line['is_playlist'] = result['is_playlist']
+                line['total_videos'] = result['playlist']['total_videos'] if result['is_playlist'] else 1
+                if result.get('partial'):
+                    line['partial'] = True
+            else:
+                line['error'] = result['error']
+            yield line
+
+def _batch_handlers(process: Callable[[str], Dict[str, Any]]) -> Tuple[Callable, Callable, Callable]:
+    """
+    Build the worker function and timeout/error handlers for a batch
+    
+    Args:
+        process: Function building the result for one URL
+        
+    Returns:
+        Tuple: (process in app context, on_timeout, on_error)
+    """
+    app = current_app._get_current_object()
+    
+    def process_in_context(url: str) -> Dict[str, Any]:
+        with app.app_context():
+            return process(url)
+    
+    def on_timeout(url: str) -> Dict[str, Any]:
+        logger.warning(f"Batch item timed out after {config.BATCH_URL_TIMEOUT}s: {url}")
+        return {'url': url, 'success': False, 'error': 'Extraction timed out'}
+    
+    def on_error(url: str, error: Exception) -> Dict[str, Any]:
+        log_error(logger, error, f"Error processing batch item {url}")
+        return {'url': url, 'success': False, 'error': 'An unexpected error occurred'}
+    
+    return process_in_context, on_timeout, on_error
+
+def run_batch(urls: List[str], process: Callable[[str], Dict[str, Any]], concurrency: int) -> List[Dict[str, Any]]:
+    """
+    Process every URL of a request, in parallel for batches
+    
+    Args:
+        urls: Request URLs
+        process: Function building the result for one URL
+        concurrency: Maximum number of this request's URLs in flight
+        
+    Returns:
+        List: One result per URL, in input order
+    """
+    if len(urls) == 1:
+        return [process(urls[0])]
+    
+    process_in_context, on_timeout, on_error = _batch_handlers(process)
+    return batch_executor.map(process_in_context, urls, concurrency, config.BATCH_URL_TIMEOUT, on_timeout, on_error)
+
+def stream_batch(urls: List[str], process: Callable[[str], Dict[str, Any]], concurrency: int) -> Iterator[Dict[str, Any]]:
+    """
+    Process the URLs of a batch in parallel, yielding each result when ready
+    
+    Args:
+        urls: Request URLs
+        process: Function building the result for one URL
+        concurrency: Maximum number of this request's URLs in flight
+        
+    Yields:
+        Dict: Result of one URL with its input 'index', in completion order
+    """
+    process_in_context, on_timeout, on_error = _batch_handlers(process)
+    for index, result in batch_executor.iter_completed(process_in_context, urls, concurrency,
+                                                        config.BATCH_URL_TIMEOUT, on_timeout, on_error):
+        yield {'index': index, **result}
+
 @video_bp.route('/get-download-links', methods=['POST'])
 def get_download_links():
     """
     Extract direct download links
     
+    Send "Accept: application/x-ndjson" to stream results line by line.
+    
     Expected JSON:
     {
         "url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
-        "format": "best"  // optional
+        "format": "best",  // optional
+        "flat": false,  // optional, list playlist entries without resolving them
+        "fields": ["title", "selected_format"],  // optional, video fields to return
+        "max_age": 120  // optional, seconds of staleness accepted from the cache
     }
     or
     {
         "urls": ["url1", "url2", ...],
-        "format": "best"  // optional
+        "format": "best",  // optional
+        "concurrency": 4  // optional
     }
     """
     try:
@@ -109,73 +476,29 @@ def get_download_links():
         
         urls = validation['urls']
         format = validation['format']
-        results = []
-        
-        for url in urls:
-            info = get_video_info_with_cache(url, format)
-            if not info['success']:
-                results.append({'url': url, 'success': False, 'error': info['error']})
-                continue
-            
-            if info['is_playlist']:
-                download_links = []
-                for video in info['playlist']['videos']:
-                    video_links = {
-                        'id': video['id'],
-                        'title': video['title'],
-                        'formats': []
-                    }
-                    for fmt in video['formats']:
-                        if fmt['url']:
-                            video_links['formats'].append({
-                                'format_id': fmt['format_id'],
-                                'format_note': fmt['format_note'],
-                                'ext': fmt['ext'],
-                                'url': fmt['url'],
-                                'filesize_formatted': fmt['filesize_formatted']
-                            })
-                    download_links.append(video_links)
-                result = {
-                    'url': url,
-                    'success': True,
-                    'is_playlist': True,
-                    'playlist': {
-                        'title': info['playlist']['title'],
-                        'total_videos': info['playlist']['total_videos'],
-                        'videos': download_links
-                    }
-                }
+        
+        def process(url: str) -> Dict[str, Any]:
+            info = get_video_info_with_cache(url, flat=validation['flat'], max_age=validation['max_age'])
+            return {'url': url, **video_service.project(info, 'download-links', format, validation['fields'])}
+        
+        if wants_ndjson():
+            if len(urls) == 1:
+                lines = stream_url_events(urls[0], format, validation['flat'], 'download-links', validation['fields'],
+                                          validation['max_age'])
             else:
-                video = info['video']
-                download_links = []
-                for fmt in video['formats']:
-                    if fmt['url']:
-                        download_links.append({
-                            'format_id': fmt['format_id'],
-                            'format_note': fmt['format_note'],
-                            'ext': fmt['ext'],
-                            'url': fmt['url'],
-                            'filesize_formatted': fmt['filesize_formatted']
-                        })
-                result = {
-                    'url': url,
-                    'success': True,
-                    'is_playlist': False,
-                    'video': {
-                        'id': video['id'],
-                        'title': video['title'],
-                        'duration_formatted': video['duration_formatted'],
-                        'formats': download_links
-                    }
-                }
-            results.append(result)
+                lines = stream_batch(urls, process, validation['concurrency'])
+            return ndjson_response(lines, 'Error in get_download_links stream')
+        
+        if len(urls) == 1:
+            response = url_response(urls[0], 'download-links', format, validation['flat'], validation['fields'],
+                                    validation['max_age'])
+        else:
+            response = jsonify({'results': run_batch(urls, process, validation['concurrency'])})
         
         duration = time.time() - start_time
         logger.info(f"Request processed in {duration:.2f} seconds")
         
-        if len(urls) == 1:
-            return jsonify(results[0]), 200 if results[0]['success'] else 400
-        return jsonify({'results': results}), 200
+        return response
         
     except Exception as e:
         log_error(logger, e, 'Error in get_download_links')
@@ -190,15 +513,21 @@ def get_video_info():
     """
     Extract detailed video information
     
+    Send "Accept: application/x-ndjson" to stream results line by line.
+    
     Expected JSON:
     {
         "url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
-        "format": "best"  // optional
+        "format": "best",  // optional
+        "flat": false,  // optional, list playlist entries without resolving them
+        "fields": ["title", "selected_format"],  // optional, video fields to return
+        "max_age": 120  // optional, seconds of staleness accepted from the cache
     }
     or
     {
         "urls": ["url1", "url2", ...],
-        "format": "best"  // optional
+        "format": "best",  // optional
+        "concurrency": 4  // optional
     }
     """
     try:
@@ -214,18 +543,29 @@ def get_video_info():
         
         urls = validation['urls']
         format = validation['format']
-        results = []
         
-        for url in urls:
-            result = get_video_info_with_cache(url, format)
-            results.append({'url': url, **result})
+        def process(url: str) -> Dict[str, Any]:
+            info = get_video_info_with_cache(url, flat=validation['flat'], max_age=validation['max_age'])
+            return {'url': url, **video_service.project(info, 'info', format, validation['fields'])}
+        
+        if wants_ndjson():
+            if len(urls) == 1:
+                lines = stream_url_events(urls[0], format, validation['flat'], 'info', validation['fields'],
+                                          validation['max_age'])
+            else:
+                lines = stream_batch(urls, process, validation['concurrency'])
+            return ndjson_response(lines, 'Error in get_video_info stream')
+        
+        if len(urls) == 1:
+            response = url_response(urls[0], 'info', format, validation['flat'], validation['fields'],
+                                    validation['max_age'])
+        else:
+            response = jsonify({'results': run_batch(urls, process, validation['concurrency'])})
         
         duration = time.time() - start_time
         logger.info(f"Request processed in {duration:.2f} seconds")
         
-        if len(urls) == 1:
-            return jsonify(results[0]), 200 if results[0]['success'] else 400
-        return jsonify({'results': results}), 200
+        return response
         
     except Exception as e:
         log_error(logger, e, 'Error in get_video_info')
@@ -242,11 +582,13 @@ def get_subtitles():
     
     Expected JSON:
     {
-        "url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+        "url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "fields": ["title"]  // optional, video fields to return
     }
     or
     {
-        "urls": ["url1", "url2", ...]
+        "urls": ["url1", "url2", ...],
+        "concurrency": 4  // optional
     }
     """
     try:
@@ -261,27 +603,20 @@ def get_subtitles():
             return jsonify({'success': False, 'error': validation['error']}), 400
         
         urls = validation['urls']
-        results = []
-        
-        for url in urls:
-            stored_result = get_stored_result(url, 'subtitles')
-            if stored_result:
-                logger.info(f"Retrieved cached subtitles for URL: {url}")
-                results.append({'url': url, **stored_result})
-                continue
-            
-            result = video_service.get_subtitles(url)
-            duration = time.time() - start_time
-            add_request_log(url, 'subtitles', result, duration)
-            logger.info(f"Processed new subtitles request for URL: {url}, duration: {duration:.2f}s")
-            results.append({'url': url, **result})
+        
+        def process(url: str) -> Dict[str, Any]:
+            info = get_video_info_with_cache(url, max_age=validation['max_age'])
+            return {'url': url, **video_service.project(info, 'subtitles', fields=validation['fields'])}
+        
+        if len(urls) == 1:
+            response = url_response(urls[0], 'subtitles', None, False, validation['fields'], validation['max_age'])
+        else:
+            response = jsonify({'results': run_batch(urls, process, validation['concurrency'])})
         
         duration = time.time() - start_time
         logger.info(f"Request processed in {duration:.2f} seconds")
         
-        if len(urls) == 1:
-            return jsonify(results[0]), 200 if results[0]['success'] else 400
-        return jsonify({'results': results}), 200
+        return response
         
     except Exception as e:
         log_error(logger, e, 'Error in get_subtitles')
@@ -298,11 +633,13 @@ def get_thumbnails():
     
     Expected JSON:
     {
-        "url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+        "url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "fields": ["title"]  // optional, video fields to return
     }
     or
     {
-        "urls": ["url1", "url2", ...]
+        "urls": ["url1", "url2", ...],
+        "concurrency": 4  // optional
     }
     """
     try:
@@ -317,27 +654,20 @@ def get_thumbnails():
             return jsonify({'success': False, 'error': validation['error']}), 400
         
         urls = validation['urls']
-        results = []
-        
-        for url in urls:
-            stored_result = get_stored_result(url, 'thumbnails')
-            if stored_result:
-                logger.info(f"Retrieved cached thumbnails for URL: {url}")
-                results.append({'url': url, **stored_result})
-                continue
-            
-            result = video_service.get_thumbnails(url)
-            duration = time.time() - start_time
-            add_request_log(url, 'thumbnails', result, duration)
-            logger.info(f"Processed new thumbnails request for URL: {url}, duration: {duration:.2f}s")
-            results.append({'url': url, **result})
+        
+        def process(url: str) -> Dict[str, Any]:
+            info = get_video_info_with_cache(url, max_age=validation['max_age'])
+            return {'url': url, **video_service.project(info, 'thumbnails', fields=validation['fields'])}
+        
+        if len(urls) == 1:
+            response = url_response(urls[0], 'thumbnails', None, False, validation['fields'], validation['max_age'])
+        else:
+            response = jsonify({'results': run_batch(urls, process, validation['concurrency'])})
         
         duration = time.time() - start_time
         logger.info(f"Request processed in {duration:.2f} seconds")
         
-        if len(urls) == 1:
-            return jsonify(results[0]), 200 if results[0]['success'] else 400
-        return jsonify({'results': results}), 200
+        return response
         
     except Exception as e:
         log_error(logger, e, 'Error in get_thumbnails')
@@ -383,6 +713,12 @@ def health_check():
             'success': True,
             'service': 'video_service',
             'status': 'healthy',
+            'warmed': video_service.warmed,
+            'cache': cache_service.stats(),
+            'rate_limit': rate_limit_service.stats(),
+            'extraction': extraction_backend.stats() if extraction_backend else {'backend': 'thread'},
+            'concurrency': video_service.concurrency.stats() if video_service.concurrency else None,
+            'circuit_breakers': video_service.circuit_breaker.stats() if video_service.circuit_breaker else None,
             'supported_extractors': ['youtube', 'vimeo', 'dailymotion', 'facebook', 'instagram', 'twitter', 'tiktok']
         }), 200
         
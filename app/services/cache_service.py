@@ -0,0 +1,365 @@
+"""
+Result cache combining an in-process memory tier with the database
+"""
+
+import hashlib
+import json
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, NamedTuple, Optional
+from app.config import Config
+from app.db import (
+    db, get_stored_entry, get_result_expiry, get_result_ttl, add_request_log, add_request_logs,
+    acquire_extraction_lock, release_extraction_lock
+)
+from app.utils.codec import dumps
+from app.utils.logger import setup_logger, log_error
+from app.utils.memory_cache import MemoryCache
+from app.utils.single_flight import SingleFlight
+from app.utils.write_behind import WriteBehindWriter
+
+class CachedResponse(NamedTuple):
+    """Serialized endpoint result, ready to send"""
+    body: bytes
+    digest: bytes  # Hash of body, used to derive ETags
+    success: bool
+
+class CacheService:
+    """
+    Two-tier cache for extraction results
+    
+    Lookups hit the bounded memory tier first and fall back to the
+    database; database hits are promoted into memory so hot URLs are
+    served without a query or a JSON parse. Serialized responses derived
+    from cached results are kept in a separate memory tier so repeated
+    requests are answered with stored bytes.
+    
+    Hot entries are refreshed in the background CACHE_REFRESH_AHEAD
+    seconds before they go stale, and callers may accept stale entries
+    (up to CACHE_EXPIRY_MARGIN, while their signed URLs still work), which
+    also triggers a background refresh. Popular URLs therefore rarely
+    wait for an extraction. A refresh that fails transiently leaves the
+    cached entry in place and is counted as failed.
+    """
+    
+    def __init__(self):
+        """
+        Initialize the service
+        """
+        self.logger = setup_logger('cache_service')
+        self.config = Config()
+        self.memory = MemoryCache(self.config.MEMORY_CACHE_MAX_BYTES, self.config.CACHE_EXPIRY_MARGIN)
+        self.responses = MemoryCache(self.config.RESPONSE_CACHE_MAX_BYTES, self.config.CACHE_EXPIRY_MARGIN)
+        self.flight = SingleFlight()
+        self.writer: Optional[WriteBehindWriter] = None
+        self._refresher: Optional[ThreadPoolExecutor] = None
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        self.refreshes = {'scheduled': 0, 'completed': 0, 'failed': 0, 'stale_served': 0}
+    
+    def start_writer(self, app):
+        """
+        Switch database writes to a write-behind background thread
+        
+        Until this is called (or with WRITE_BEHIND_ENABLED off), set()
+        writes synchronously.
+        
+        Args:
+            app: Flask application providing the database context
+        """
+        if self.writer is not None or not self.config.WRITE_BEHIND_ENABLED:
+            return
+        
+        def write(records):
+            with app.app_context():
+                try:
+                    add_request_logs(records)
+                except Exception as e:
+                    db.session.rollback()
+                    log_error(self.logger, e, f"Error writing {len(records)} cached results")
+                    raise
+        
+        self.writer = WriteBehindWriter(
+            write,
+            self.config.WRITE_BEHIND_BATCH_SIZE,
+            self.config.WRITE_BEHIND_MAX_DELAY,
+            self.config.WRITE_BEHIND_MAX_PENDING
+        )
+        self.writer.start()
+    
+    def _memory_key(self, key: str, format: str) -> str:
+        """Build the memory tier key for a (key, format) pair"""
+        return f"{format}|{key}"
+    
+    def _memory_expiry(self, expires_at: datetime) -> float:
+        """Convert a stored naive UTC expiry into the memory tier's deadline"""
+        return expires_at.replace(tzinfo=timezone.utc).timestamp() - self.config.CACHE_EXPIRY_MARGIN
+    
+    def _max_stale(self, max_age: float) -> float:
+        """Clamp a client's staleness tolerance to the window in which signed URLs still work"""
+        return min(max(0.0, max_age), self.config.CACHE_EXPIRY_MARGIN)
+    
+    def get(self, key: str, format: str, max_age: float = 0.0,
+            refresh: Optional[Callable[[], Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result
+        
+        Args:
+            key: Cache key of the request
+            format: Requested format
+            max_age: Seconds past its freshness limit a result is still accepted
+            refresh: Function re-extracting and storing the result; when
+                given, stale and hot expiring hits are refreshed in the background
+            
+        Returns:
+            Dict: Cached result, or None on a miss
+        """
+        memory_key = self._memory_key(key, format)
+        max_stale = self._max_stale(max_age)
+        entry = self.memory.get_entry(memory_key, max_stale)
+        if entry is not None:
+            result, fresh_until, hits = entry
+            self._revalidate(memory_key, bool(result.get('success')), fresh_until, hits, refresh)
+            return result
+        
+        stored = get_stored_entry(key, format, max_stale)
+        if stored is None:
+            return None
+        result, expires_at, size = stored
+        fresh_until = self._memory_expiry(expires_at)
+        self.memory.set(memory_key, result, fresh_until, size)
+        self._revalidate(memory_key, bool(result.get('success')), fresh_until, 0, refresh)
+        return result
+    
+    def _revalidate(self, memory_key: str, success: bool, fresh_until: float, hits: int,
+                    refresh: Optional[Callable[[], Any]]):
+        """Schedule a background refresh of a hit that is stale, or hot and close to going stale"""
+        if refresh is None or not success:
+            return
+        remaining = fresh_until - time.time()
+        if remaining <= 0:
+            self.refreshes['stale_served'] += 1
+        elif remaining > self.config.CACHE_REFRESH_AHEAD or hits < self.config.CACHE_REFRESH_MIN_HITS:
+            return
+        
+        with self._refresh_lock:
+            if memory_key in self._refreshing:
+                return
+            self._refreshing.add(memory_key)
+            if self._refresher is None:
+                self._refresher = ThreadPoolExecutor(self.config.CACHE_REFRESH_WORKERS,
+                                                     thread_name_prefix='cache-refresh')
+            self.refreshes['scheduled'] += 1
+        self._refresher.submit(self._run_refresh, memory_key, refresh)
+    
+    def _run_refresh(self, memory_key: str, refresh: Callable[[], Any]):
+        """Background refresh task; shares the flight of concurrent misses for the same key"""
+        try:
+            result = self.flight.do(memory_key, refresh)
+            if not isinstance(result, dict) or not result.get('success') or result.get('partial'):
+                self.refreshes['failed'] += 1
+            else:
+                self.refreshes['completed'] += 1
+        except Exception as e:
+            self.refreshes['failed'] += 1
+            log_error(self.logger, e, f"Error refreshing cached result {memory_key}")
+        finally:
+            with self._refresh_lock:
+                self._refreshing.discard(memory_key)
+    
+    def set(self, key: str, format: str, result: Dict[str, Any], duration: float):
+        """
+        Store a fresh result in both tiers
+        
+        The memory tier is updated immediately; the database write is
+        queued when the write-behind writer is running.
+        
+        Args:
+            key: Cache key of the request
+            format: Requested format
+            result: Result data or error
+            duration: Extraction duration in seconds
+        """
+        if get_result_ttl(result) <= 0:
+            return
+        if self.writer is not None:
+            expires_at = get_result_expiry(result)
+            self.writer.submit((key, format, result, duration))
+        else:
+            expires_at = add_request_log(key, format, result, duration)
+        try:
+            size = len(json.dumps(result))
+        except TypeError:
+            return
+        self.memory.set(self._memory_key(key, format), result, self._memory_expiry(expires_at), size)
+    
+    def get_response(self, key: str, format: str, variant: str, max_age: float = 0.0,
+                     refresh: Optional[Callable[[], Any]] = None) -> Optional[CachedResponse]:
+        """
+        Look up a serialized response derived from a cached result
+        
+        A response close to going stale is dropped once its result has
+        been refreshed, so the caller rebuilds it from the fresh result.
+        
+        Args:
+            key: Cache key of the request
+            format: Cache format of the underlying result
+            variant: Identifies the projection (endpoint, selector, fields)
+            max_age: Seconds past its freshness limit a response is still accepted
+            refresh: Function re-extracting and storing the underlying result
+            
+        Returns:
+            CachedResponse: Stored response, or None on a miss
+        """
+        memory_key = self._memory_key(key, format)
+        entry = self.responses.get_entry(f"{variant}|{memory_key}", self._max_stale(max_age))
+        if entry is None:
+            return None
+        cached, fresh_until, hits = entry
+        if fresh_until - time.time() <= self.config.CACHE_REFRESH_AHEAD:
+            result_fresh_until = self.memory.peek_expiry(memory_key)
+            if result_fresh_until is not None and result_fresh_until > fresh_until:
+                return None
+            self._revalidate(memory_key, cached.success, fresh_until, hits, refresh)
+        return cached
+    
+    def set_response(self, key: str, format: str, variant: str, source: Dict[str, Any],
+                     response: Dict[str, Any]) -> CachedResponse:
+        """
+        Serialize a response and keep it as long as the result it came from
+        
+        Responses of results that are not cached (rejections) are not kept
+        either, so they are never served stale.
+        
+        Args:
+            key: Cache key of the request
+            format: Cache format of the underlying result
+            variant: Identifies the projection (endpoint, selector, fields)
+            source: Cached result the response was projected from
+            response: Endpoint result to serialize
+            
+        Returns:
+            CachedResponse: Serialized response
+        """
+        body = dumps(response)
+        cached = CachedResponse(body, hashlib.blake2b(body, digest_size=16).digest(), bool(response.get('success')))
+        if get_result_ttl(source) <= 0:
+            return cached
+        expires_at = self._memory_expiry(get_result_expiry(source))
+        self.responses.set(f"{variant}|{self._memory_key(key, format)}", cached, expires_at, len(body))
+        return cached
+    
+    def coalesce(self, key: str, format: str, extract: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Run a cache-filling extraction once for all concurrent callers
+        
+        Threads of this process share one in-flight call. With
+        SINGLE_FLIGHT_DISTRIBUTED enabled, processes additionally serialize
+        on a lock row and followers poll the cache for the leader's result.
+        
+        Args:
+            key: Cache key of the request
+            format: Requested format
+            extract: Function performing the extraction and storing its result
+            
+        Returns:
+            Dict: Result of the (possibly shared) extraction
+        """
+        result = self.flight.do(self._memory_key(key, format), lambda: self._extract_once(key, format, extract))
+        if result is None:
+            # The flight was led by a streamed request whose client went away before the end
+            return self._extract_once(key, format, extract)
+        return result
+    
+    def coalesce_stream(self, key: str, format: str, extract: Callable[[], Iterator[Dict[str, Any]]],
+                        replay: Callable[[Dict[str, Any]], Iterator[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+        """
+        Stream a cache-filling extraction once for all concurrent callers
+        
+        The leader streams the extraction's events as they are produced;
+        followers, streamed or not, wait for its result and replay it. If
+        the leader's client disconnects before the end, the extraction
+        stops and followers extract on their own.
+        
+        Args:
+            key: Cache key of the request
+            format: Requested format
+            extract: Function streaming the extraction's events and storing its result
+            replay: Function turning a result into events
+            
+        Yields:
+            Dict: Extraction events
+        """
+        memory_key = self._memory_key(key, format)
+        call, leader = self.flight.join(memory_key)
+        if not leader:
+            result = self.flight.wait(call)
+            yield from replay(result) if result is not None else extract()
+            return
+        
+        result = None
+        error = None
+        try:
+            # A previous flight may have filled the cache since the caller's miss
+            result = self.get(key, format)
+            if result is not None:
+                yield from replay(result)
+                return
+            for event in extract():
+                if event['type'] == 'end':
+                    result = event['result']
+                yield event
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self.flight.finish(memory_key, call, result, error)
+    
+    def _extract_once(self, key: str, format: str, extract: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Leader side of coalesce: recheck the cache, then extract under the lock"""
+        # A previous flight may have filled the cache since the caller's miss
+        result = self.get(key, format)
+        if result is not None:
+            return result
+        
+        if not self.config.SINGLE_FLIGHT_DISTRIBUTED:
+            return extract()
+        
+        lock_key = self._memory_key(key, format)
+        owner = f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+        deadline = time.time() + self.config.SINGLE_FLIGHT_LOCK_TTL
+        while not acquire_extraction_lock(lock_key, owner, self.config.SINGLE_FLIGHT_LOCK_TTL):
+            if time.time() >= deadline:
+                self.logger.warning(f"Gave up waiting for extraction lock on {lock_key}")
+                break
+            time.sleep(self.config.SINGLE_FLIGHT_POLL_INTERVAL)
+            result = self.get(key, format)
+            if result is not None:
+                return result
+        
+        try:
+            return extract()
+        finally:
+            # Followers in other processes read the result from the database
+            if self.writer is not None:
+                self.writer.flush()
+            release_extraction_lock(lock_key, owner)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters
+        
+        Returns:
+            Dict: Memory tiers, request coalescing, refresh and write-behind statistics
+        """
+        return {
+            'memory': self.memory.stats(),
+            'responses': self.responses.stats(),
+            'single_flight': self.flight.stats(),
+            'refresh': {**self.refreshes, 'in_flight': len(self._refreshing)},
+            'write_behind': self.writer.stats() if self.writer else None
+        }
\ No newline at end of file
@@ -0,0 +1,228 @@
+"""
+Persistent queue and background workers for asynchronous extraction jobs
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+from sqlalchemy import and_, or_
+from app.config import Config
+from app.db import db, Job, JobItem
+from app.utils.logger import setup_logger, log_error
+
+def _job_fields(job: Job) -> Optional[List[str]]:
+    """Read a job's comma-separated sparse fieldset; '' is the empty fieldset"""
+    if job.fields is None:
+        return None
+    return job.fields.split(',') if job.fields else []
+
+class JobService:
+    """
+    Job queue stored in the application database
+    
+    Each URL of a job is a row that workers claim with a compare-and-set
+    update and a lease, so any number of worker threads and processes can
+    drain the queue, and rows claimed by a worker that died are picked up
+    again once the lease expires (including after a restart).
+    """
+    
+    def __init__(self):
+        """
+        Initialize the service
+        """
+        self.logger = setup_logger('job_service')
+        self.config = Config()
+        self.stopping = threading.Event()
+        self._workers: List[threading.Thread] = []
+    
+    def create_job(self, kind: str, urls: List[str], format: str, flat: bool = False,
+                   fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Enqueue a job
+        
+        Args:
+            kind: 'info' or 'download-links'
+            urls: URLs to process
+            format: Requested format
+            flat: Whether playlist entries are returned unresolved
+            fields: Optional sparse fieldset of the videos
+            
+        Returns:
+            Dict: Job status
+        """
+        job = Job(id=uuid.uuid4().hex, kind=kind, format=format, flat=flat,
+                  fields=','.join(fields) if fields is not None else None)
+        db.session.add(job)
+        db.session.add_all(JobItem(job_id=job.id, index=index, url=url) for index, url in enumerate(urls))
+        db.session.commit()
+        self.logger.info(f"Enqueued job {job.id} with {len(urls)} URLs")
+        return self.get_job(job.id)
+    
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the progress and (partial) results of a job
+        
+        Args:
+            job_id: Job id
+            
+        Returns:
+            Dict: Job status, or None if the job does not exist
+        """
+        job = db.session.get(Job, job_id)
+        if job is None:
+            return None
+        
+        results = []
+        counts = {'queued': 0, 'running': 0, 'done': 0, 'failed': 0}
+        for item in job.items:
+            counts[item.status] += 1
+            entry = {'index': item.index, 'url': item.url, 'status': item.status}
+            if item.result is not None:
+                entry['result'] = json.loads(item.result)
+            results.append(entry)
+        
+        total = len(results)
+        finished = counts['done'] + counts['failed']
+        if finished == total:
+            status = 'completed'
+        elif counts['running'] or finished:
+            status = 'running'
+        else:
+            status = 'queued'
+        
+        return {
+            'id': job.id,
+            'type': job.kind,
+            'format': job.format,
+            'flat': job.flat,
+            'fields': _job_fields(job),
+            'status': status,
+            'created_at': job.created_at.isoformat() + 'Z',
+            'total': total,
+            'completed': finished,
+            'failed': counts['failed'],
+            'progress': round(finished / total, 4) if total else 1.0,
+            'results': results
+        }
+    
+    def _claimable(self, now: datetime):
+        """Filter for rows that are queued or whose lease has expired"""
+        return or_(
+            JobItem.status == 'queued',
+            and_(JobItem.status == 'running', JobItem.lease_expires_at <= now)
+        )
+    
+    def claim_item(self, owner: str) -> Optional[JobItem]:
+        """
+        Claim the oldest claimable job item
+        
+        Args:
+            owner: Identity of the claiming worker
+            
+        Returns:
+            JobItem: Claimed item, or None if the queue is empty
+        """
+        for _ in range(5):
+            now = datetime.utcnow()
+            candidate = db.session.query(JobItem.id).filter(self._claimable(now)).order_by(JobItem.id).first()
+            if candidate is None:
+                return None
+            
+            # Compare-and-set: only one worker can move the row out of the claimable state
+            claimed = JobItem.query.filter(JobItem.id == candidate.id, self._claimable(now)).update({
+                'status': 'running',
+                'claimed_by': owner,
+                'lease_expires_at': now + timedelta(seconds=self.config.JOB_LEASE_SECONDS),
+                'attempts': JobItem.attempts + 1,
+                'updated_at': now
+            }, synchronize_session=False)
+            db.session.commit()
+            if not claimed:
+                continue
+            
+            item = db.session.get(JobItem, candidate.id)
+            if item.attempts > self.config.JOB_MAX_ATTEMPTS:
+                self.complete_item(item.id, owner, {
+                    'success': False,
+                    'error': 'Extraction did not finish after repeated attempts'
+                }, status='failed')
+                continue
+            return item
+        return None
+    
+    def complete_item(self, item_id: int, owner: str, result: Dict[str, Any], status: str = 'done'):
+        """
+        Store the result of a claimed item, unless its lease was taken over
+        
+        Args:
+            item_id: Job item id
+            owner: Identity of the worker holding the claim
+            result: Result data or error
+            status: Final item status
+        """
+        JobItem.query.filter(JobItem.id == item_id, JobItem.claimed_by == owner).update({
+            'status': status,
+            'result': json.dumps(result),
+            'lease_expires_at': None,
+            'updated_at': datetime.utcnow()
+        }, synchronize_session=False)
+        db.session.commit()
+    
+    def start_workers(self, app, count: int, process: Callable[[str, str, str, bool, Optional[List[str]]], Dict[str, Any]]):
+        """
+        Start background threads that drain the queue
+        
+        Args:
+            app: Flask application providing the database context
+            count: Number of worker threads
+            process: Function (kind, url, format, flat, fields) -> result
+        """
+        for _ in range(count):
+            worker = threading.Thread(target=self._work, args=(app, process), daemon=True,
+                                      name=f"job-worker-{len(self._workers)}")
+            self._workers.append(worker)
+            worker.start()
+        if count:
+            self.logger.info(f"Started {count} job worker threads")
+    
+    def stop(self, timeout: float = 0):
+        """
+        Ask the worker threads to stop after their current item
+        
+        Items still running when the timeout ends are retried by another
+        worker once their lease expires.
+        
+        Args:
+            timeout: Seconds to wait for the threads to finish
+        """
+        self.stopping.set()
+        deadline = time.time() + timeout
+        for worker in self._workers:
+            worker.join(max(0.0, deadline - time.time()))
+    
+    def _work(self, app, process: Callable[[str, str, str, bool, Optional[List[str]]], Dict[str, Any]]):
+        """Worker thread loop"""
+        owner = f"{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}"
+        while not self.stopping.is_set():
+            try:
+                with app.app_context():
+                    item = self.claim_item(owner)
+                    if item is not None:
+                        job = item.job
+                        try:
+                            fields = _job_fields(job)
+                            result = process(job.kind, item.url, job.format, job.flat, fields)
+                        except Exception as e:
+                            log_error(self.logger, e, f"Error processing job {job.id} item {item.index}")
+                            result = {'success': False, 'error': 'An unexpected error occurred', 'message': str(e)}
+                        done = result.get('success') and not result.get('partial')
+                        self.complete_item(item.id, owner, result, 'done' if done else 'failed')
+                        continue
+            except Exception as e:
+                log_error(self.logger, e, 'Error in job worker')
+            self.stopping.wait(self.config.JOB_POLL_INTERVAL)
\ No newline at end of file
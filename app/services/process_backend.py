@@ -0,0 +1,369 @@
+"""
+Process-pool extraction backend
+"""
+
+import atexit
+import multiprocessing
+import os
+import queue
+import resource
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+from app.services.video_service import VideoService, YTDLPLogger, partial_playlist_result, timeout_result
+from app.utils.logger import setup_logger, log_error
+
+def _current_rss() -> int:
+    """
+    Get the resident set size of the current process
+    
+    Returns:
+        int: RSS in bytes (peak RSS where /proc is unavailable)
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def _process_rss(pid: int) -> Optional[int]:
+    """
+    Get the resident set size of another process
+    
+    Args:
+        pid: Process id
+        
+    Returns:
+        int: RSS in bytes, or None where /proc is unavailable
+    """
+    try:
+        with open(f'/proc/{pid}/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+def _worker_main(conn, max_jobs: int, max_rss: int):
+    """
+    Worker process loop: extract jobs until asked to stop or over budget
+    
+    Every extraction event is sent as soon as it is produced, paired with
+    whether the worker retires after the job (only meaningful on 'end').
+    Jobs run ungated: the parent already holds the concurrency slot and
+    passed the circuit breaker. The 'end' event also carries the number
+    of throttling messages, which only this process sees.
+    
+    Args:
+        conn: Pipe end shared with the parent
+        max_jobs: Number of jobs after which the worker retires
+        max_rss: RSS in bytes above which the worker retires
+    """
+    service = VideoService()
+    service.warm()
+    
+    jobs = 0
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if job is None:
+            break
+        
+        retiring = False
+        for event in service._iter_video_info(*job):
+            if event['type'] == 'end':
+                event = {**event, 'throttled': YTDLPLogger.throttled()}
+                jobs += 1
+                retiring = jobs >= max_jobs or _current_rss() > max_rss
+            conn.send((event, retiring))
+        if retiring:
+            break
+    conn.close()
+
+class _Worker:
+    """Handle on one worker process"""
+    def __init__(self, context, max_jobs: int, max_rss: int):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, max_jobs, max_rss), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+class ProcessExtractionBackend:
+    """
+    Run get_video_info in a pool of pre-started worker processes
+    
+    yt-dlp's parsing and signature deciphering hold the GIL, so threads
+    of the API process cannot use more than one core for it. Workers are
+    forked from a server that has already imported the extraction stack,
+    each handles one job at a time, and each is replaced after
+    PROCESS_WORKER_MAX_JOBS jobs or once its RSS exceeds
+    PROCESS_WORKER_MAX_RSS_MB, so a huge playlist cannot bloat the API
+    process or a worker indefinitely. A worker still busy KILL_GRACE
+    seconds after its job's deadline is killed, which cancels the
+    extraction even where yt-dlp is stuck in a single network call, and
+    so is a worker whose RSS grows past RSS_KILL_FACTOR times the limit
+    in the middle of a job. Workers that cannot be restarted are started
+    again on a later job, so the pool does not shrink for good.
+    """
+    
+    # Seconds a worker gets past the deadline to stop on its own
+    KILL_GRACE = 2.0
+    
+    # Multiple of PROCESS_WORKER_MAX_RSS_MB at which a busy worker is killed
+    RSS_KILL_FACTOR = 2.0
+    
+    # Seconds between memory checks of a busy worker
+    WATCHDOG_INTERVAL = 1.0
+    
+    def __init__(self, workers: int, max_jobs: int, max_rss_mb: int):
+        """
+        Initialize the backend; worker processes start on first use
+        
+        Starting lazily keeps module imports free of side effects, which
+        matters because spawned children re-import the entry module.
+        
+        Args:
+            workers: Number of worker processes
+            max_jobs: Jobs per worker before it is recycled
+            max_rss_mb: RSS limit per worker in megabytes
+        """
+        self.logger = setup_logger('process_backend')
+        self.workers = workers
+        self.max_jobs = max_jobs
+        self.max_rss = max_rss_mb * 1024 * 1024
+        self._context = None
+        self._lock = threading.Lock()
+        self._refill_lock = threading.Lock()
+        self._idle: 'queue.Queue[_Worker]' = queue.Queue()
+        self._workers = []
+        self.jobs = 0
+        self.recycled = 0
+        self.crashed = 0
+        self.killed = 0
+        self._started = False
+        self._closed = False
+    
+    def start(self):
+        """
+        Start the worker processes if they are not running yet
+        """
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            
+            if 'forkserver' in multiprocessing.get_all_start_methods():
+                self._context = multiprocessing.get_context('forkserver')
+                self._context.set_forkserver_preload(['yt_dlp', 'app.services.video_service'])
+            else:
+                self._context = multiprocessing.get_context('spawn')
+            
+            for _ in range(self.workers):
+                worker = _Worker(self._context, self.max_jobs, self.max_rss)
+                self._workers.append(worker)
+                self._idle.put(worker)
+            atexit.register(self.close)
+        self.logger.info(f"Started {self.workers} extraction worker processes")
+    
+    def _replace(self, worker: _Worker) -> Optional[_Worker]:
+        """Reap a retired or dead worker and start its successor; None if it could not be started"""
+        worker.conn.close()
+        worker.process.join(timeout=5)
+        if worker.process.is_alive():
+            worker.process.kill()
+            worker.process.join()
+        try:
+            successor = _Worker(self._context, self.max_jobs, self.max_rss)
+        except Exception as e:
+            with self._lock:
+                self._workers.remove(worker)
+            log_error(self.logger, e, 'Error starting an extraction worker process')
+            return None
+        with self._lock:
+            self._workers[self._workers.index(worker)] = successor
+        return successor
+    
+    def _refill(self):
+        """Start workers missing from the pool because an earlier restart failed"""
+        if len(self._workers) >= self.workers or not self._refill_lock.acquire(blocking=False):
+            return
+        try:
+            while len(self._workers) < self.workers:
+                worker = _Worker(self._context, self.max_jobs, self.max_rss)
+                with self._lock:
+                    self._workers.append(worker)
+                self._idle.put(worker)
+        except Exception as e:
+            log_error(self.logger, e, 'Error starting an extraction worker process')
+        finally:
+            self._refill_lock.release()
+    
+    def _kill(self, worker: _Worker, url: str, reason: str):
+        """Kill a busy worker"""
+        worker.process.kill()
+        with self._lock:
+            self.killed += 1
+        self.logger.warning(f"Killed extraction worker {worker.process.pid} {reason} of {url}")
+    
+    def iter_video_info(self, url: str, format_selector: Optional[str] = 'best', enable_subtitles: bool = False,
+                        flat_playlist: bool = False, deadline: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Extract video or playlist information in a worker process, streaming its events
+        
+        Args:
+            url: Video or playlist URL
+            format_selector: Desired format selector
+            enable_subtitles: Whether to extract subtitles
+            flat_playlist: Whether to return playlist entries unresolved
+            deadline: Unix time by which the extraction is cancelled, or None
+            
+        Yields:
+            Dict: Extraction events (see VideoService.iter_video_info)
+        """
+        self.start()
+        self._refill()
+        try:
+            if not self._workers:
+                raise queue.Empty
+            worker = self._idle.get(timeout=None if deadline is None else max(0.0, deadline - time.time()))
+        except queue.Empty:
+            yield {'type': 'end', 'success': False, 'result': {
+                'success': False,
+                'error': 'No extraction worker available',
+                'message': 'All extraction workers are busy, try again later',
+                'rejected': True,
+                'retryable': True
+            }}
+            return
+        
+        finished = False
+        retiring = True
+        dead = False
+        playlist, videos = None, []
+        try:
+            worker.conn.send((url, format_selector, enable_subtitles, flat_playlist, deadline))
+            next_check = time.time() + self.WATCHDOG_INTERVAL
+            while True:
+                now = time.time()
+                if now >= next_check:
+                    next_check = now + self.WATCHDOG_INTERVAL
+                    rss = _process_rss(worker.process.pid)
+                    if rss is not None and rss > self.max_rss * self.RSS_KILL_FACTOR:
+                        dead = True
+                        self._kill(worker, url, f"at {rss // (1024 * 1024)} MB RSS during the extraction")
+                        result = partial_playlist_result(playlist, videos) if playlist is not None else {
+                            'success': False,
+                            'error': 'Extraction used too much memory',
+                            'message': 'The extraction worker exceeded its memory limit',
+                            'retryable': False
+                        }
+                        finished = True
+                        yield {'type': 'end', 'success': result['success'], 'result': result}
+                        return
+                
+                timeout = max(0.0, next_check - now)
+                if deadline is not None:
+                    timeout = min(timeout, max(0.0, deadline + self.KILL_GRACE - now))
+                if not worker.conn.poll(timeout):
+                    if deadline is None or time.time() < deadline + self.KILL_GRACE:
+                        continue
+                    dead = True
+                    self._kill(worker, url, 'at the deadline')
+                    result = partial_playlist_result(playlist, videos) if playlist is not None else timeout_result()
+                    finished = True
+                    yield {'type': 'end', 'success': result['success'], 'result': result}
+                    return
+                
+                event, retiring = worker.conn.recv()
+                if event['type'] == 'playlist':
+                    playlist = event['playlist']
+                elif event['type'] == 'video':
+                    videos.append(event['video'])
+                elif event['type'] == 'end':
+                    finished = True
+                yield event
+                if finished:
+                    return
+        except (EOFError, OSError) as e:
+            dead = True
+            with self._lock:
+                self.crashed += 1
+            self.logger.error(f"Extraction worker {worker.process.pid} died while processing {url}: {e}")
+            finished = True
+            result = {
+                'success': False,
+                'error': 'An unexpected error occurred',
+                'message': 'Extraction worker exited unexpectedly',
+                'retryable': True
+            }
+            yield {'type': 'end', 'success': False, 'result': result}
+        finally:
+            # A worker left mid-job (killed, crashed or abandoned by the consumer) cannot be reused
+            retiring = retiring or dead or not finished
+            with self._lock:
+                self.jobs += 1
+                if retiring:
+                    self.recycled += 1
+            if retiring:
+                if dead or not finished:
+                    worker.process.kill()
+                worker = self._replace(worker)
+            if worker is not None:
+                self._idle.put(worker)
+    
+    def get_video_info(self, url: str, format_selector: Optional[str] = 'best', enable_subtitles: bool = False,
+                       flat_playlist: bool = False, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Extract video or playlist information in a worker process
+        
+        Args:
+            url: Video or playlist URL
+            format_selector: Desired format selector
+            enable_subtitles: Whether to extract subtitles
+            flat_playlist: Whether to return playlist entries unresolved
+            deadline: Unix time by which the extraction is cancelled, or None
+            
+        Returns:
+            Dict: Video or playlist information
+        """
+        result = None
+        for event in self.iter_video_info(url, format_selector, enable_subtitles, flat_playlist, deadline):
+            if event['type'] == 'end':
+                result = event['result']
+        return result
+    
+    def close(self):
+        """
+        Stop all worker processes
+        """
+        if self._closed or not self._started:
+            return
+        self._closed = True
+        for worker in self._workers:
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+        for worker in self._workers:
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.kill()
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get backend counters
+        
+        Returns:
+            Dict: Worker, job, recycle and crash counts
+        """
+        with self._lock:
+            return {
+                'backend': 'process',
+                'started': self._started,
+                'workers': len(self._workers),
+                'idle_workers': self._idle.qsize(),
+                'jobs': self.jobs,
+                'recycled': self.recycled,
+                'crashed': self.crashed,
+                'killed': self.killed
+            }
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""
+Per-client request rate limiting
+"""
+
+from typing import Any, Dict
+from app.config import Config
+from app.db import db, take_rate_limit_token
+from app.utils.logger import setup_logger, log_error
+from app.utils.token_bucket import TokenBucketLimiter
+
+class RateLimitService:
+    """
+    Token-bucket rate limiter for API clients
+    
+    Every request is checked against an in-memory bucket of the current
+    process. With RATE_LIMIT_SHARED the requests it admits are also
+    charged to a bucket in the database, so the limit holds across all
+    worker processes; clients already over the limit are rejected from
+    memory without a query.
+    """
+    
+    def __init__(self):
+        """
+        Initialize the service
+        """
+        self.logger = setup_logger('rate_limit_service')
+        self.config = Config()
+        self.limiter = TokenBucketLimiter(self.config.RATE_LIMIT_REQUESTS, self.config.RATE_LIMIT_WINDOW,
+                                          self.config.RATE_LIMIT_MAX_CLIENTS)
+        self.shared_limited = 0
+        self.shared_errors = 0
+    
+    def check(self, client: str) -> float:
+        """
+        Charge one request to a client
+        
+        Args:
+            client: Client identifier
+            
+        Returns:
+            float: 0.0 if the request is allowed, else seconds the client should wait
+        """
+        retry_after = self.limiter.acquire(client)
+        if retry_after or not self.config.RATE_LIMIT_SHARED:
+            return retry_after
+        
+        try:
+            retry_after = take_rate_limit_token(client, self.limiter.capacity, self.limiter.rate)
+        except Exception as e:
+            # Fail open: an unavailable database must not take the API down
+            db.session.rollback()
+            self.shared_errors += 1
+            log_error(self.logger, e, 'Error checking shared rate limit')
+            return 0.0
+        if retry_after:
+            self.shared_limited += 1
+        return retry_after
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get rate limiter statistics
+        
+        Returns:
+            Dict: Limit settings and counters
+        """
+        return {
+            'enabled': self.config.RATE_LIMIT_ENABLED,
+            'shared': self.config.RATE_LIMIT_SHARED,
+            'requests': self.config.RATE_LIMIT_REQUESTS,
+            'window': self.config.RATE_LIMIT_WINDOW,
+            **self.limiter.stats(),
+            'shared_limited': self.shared_limited,
+            'shared_errors': self.shared_errors
+        }
\ No newline at end of file
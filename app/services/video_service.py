@@ -2,55 +2,197 @@
 Video information extraction service using yt-dlp
 """
 
-import yt_dlp
+import itertools
+import math
+import threading
 import time
 import re
-from typing import Dict, List, Optional, Any, Union
+from typing import Collection, Dict, Iterator, List, Optional, Any, Tuple, Union
 from urllib.parse import urlparse
 from app.utils.logger import setup_logger, log_error, log_video_extraction
 from app.config import Config
+from app.services.ydl_pool import YoutubeDLPool
+from app.utils.adaptive_limiter import AdaptiveConcurrencyLimiter
+from app.utils.circuit_breaker import CircuitBreaker
+from app.utils.format_selector import FormatSelector
+from app.utils.url_normalizer import normalize_url
+
+# yt-dlp messages that mean a site is throttling us
+THROTTLE_PATTERN = re.compile(
+    r"HTTP Error 429|Too Many Requests|rate[- ]?limit|confirm you.re not a bot|try again later", re.IGNORECASE
+)
+
+# Errors about the requested content rather than the site or its extractor
+CONTENT_ERROR_PATTERN = re.compile(
+    r"unavailable|removed|private|geo-restricted|not available in your country|copyright|"
+    r"Sign in to confirm your age|members-only|Invalid URL|Unsupported URL|does not exist|HTTP Error 404",
+    re.IGNORECASE
+)
 
 class YTDLPLogger:
-    """Logger adapter for yt-dlp"""
+    """
+    Logger adapter for yt-dlp
+    
+    Also records throttling messages and the last error per thread, and
+    cancels the thread's extraction once its deadline has passed by
+    raising DownloadCancelled from the next message, which yt-dlp lets
+    through even with ignoreerrors. Pooled YoutubeDL instances keep the
+    logger they were created with, but always extract in the calling
+    thread, so the signals belong to the current extraction.
+    """
+    _signals = threading.local()
+
     def __init__(self, logger):
         self.logger = logger
 
+    @classmethod
+    def reset_signals(cls, deadline: Optional[float] = None):
+        """Forget the throttling messages and last error of the current thread and set its deadline (Unix time)"""
+        cls._signals.throttled = 0
+        cls._signals.last_error = None
+        cls._signals.deadline = deadline
+
+    @classmethod
+    def clear_deadline(cls):
+        """Stop cancelling extractions of the current thread"""
+        cls._signals.deadline = None
+
+    @classmethod
+    def throttled(cls) -> int:
+        """Number of throttling messages of the current thread since the last reset"""
+        return getattr(cls._signals, 'throttled', 0)
+
+    @classmethod
+    def last_error(cls) -> Optional[str]:
+        """Last error message of the current thread since the last reset"""
+        return getattr(cls._signals, 'last_error', None)
+
+    def _check_deadline(self):
+        deadline = getattr(self._signals, 'deadline', None)
+        if deadline is not None and time.time() >= deadline:
+            from yt_dlp.utils import DownloadCancelled
+
+            raise DownloadCancelled('Extraction deadline exceeded')
+
+    def _record(self, msg):
+        if THROTTLE_PATTERN.search(str(msg)):
+            self._signals.throttled = self.throttled() + 1
+
     def debug(self, msg):
         self.logger.debug(msg)
+        self._check_deadline()
 
     def warning(self, msg):
+        self._record(msg)
         self.logger.warning(msg)
+        self._check_deadline()
 
     def error(self, msg):
+        self._record(msg)
+        self._signals.last_error = str(msg)
         self.logger.error(msg)
+        self._check_deadline()
+
+def timeout_result() -> Dict[str, Any]:
+    """
+    Build the result of an extraction cancelled at its deadline
+    
+    Returns:
+        Dict: Error result
+    """
+    return {
+        'success': False,
+        'error': 'Extraction timed out',
+        'message': 'The extraction did not finish before the request deadline',
+        'retryable': True
+    }
+
+def partial_playlist_result(playlist: Dict[str, Any], videos: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build the result of a playlist extraction cut at its deadline
+    
+    Args:
+        playlist: Playlist metadata
+        videos: Entries resolved before the deadline
+        
+    Returns:
+        Dict: Playlist result flagged as partial
+    """
+    return {
+        'success': True,
+        'is_playlist': True,
+        'playlist': {**playlist, 'videos': videos, 'total_videos': len(videos)},
+        'partial': True
+    }
 
 class VideoService:
     """
     Service for extracting video information from multiple platforms
     """
     
-    def __init__(self):
+    # Video fields clients can select with sparse fieldsets
+    VIDEO_FIELDS = (
+        'id', 'title', 'uploader', 'uploader_id', 'uploader_url', 'upload_date', 'duration',
+        'duration_formatted', 'view_count', 'like_count', 'dislike_count', 'comment_count',
+        'description', 'thumbnail', 'thumbnails', 'webpage_url', 'original_url', 'extractor',
+        'extractor_key', 'formats', 'tags', 'categories', 'age_limit', 'availability', 'subtitles',
+        'url', 'resolved', 'selected_format'
+    )
+    
+    def __init__(self, extraction_backend: Optional[Any] = None):
         """
         Initialize the service
+        
+        Args:
+            extraction_backend: Optional backend that runs get_video_info
+                elsewhere (e.g. ProcessExtractionBackend); extraction runs
+                in-process when omitted
         """
         self.logger = setup_logger('video_service')
+        self.extraction_backend = extraction_backend
         self.config = Config()
+        self.ydl_pool = YoutubeDLPool(self.config.YDL_POOL_MAX_IDLE, self.config.YDL_POOL_MAX_USES)
+        self.concurrency = None
+        if self.config.ADAPTIVE_CONCURRENCY_ENABLED:
+            self.concurrency = AdaptiveConcurrencyLimiter(
+                self.config.ADAPTIVE_CONCURRENCY_INITIAL, self.config.ADAPTIVE_CONCURRENCY_MIN,
+                self.config.ADAPTIVE_CONCURRENCY_MAX, self.config.ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE
+            )
+        self.circuit_breaker = None
+        if self.config.CIRCUIT_BREAKER_ENABLED:
+            self.circuit_breaker = CircuitBreaker(
+                self.config.CIRCUIT_BREAKER_FAILURE_RATE, self.config.CIRCUIT_BREAKER_WINDOW,
+                self.config.CIRCUIT_BREAKER_MIN_CALLS, self.config.CIRCUIT_BREAKER_OPEN_SECONDS,
+                self.config.CIRCUIT_BREAKER_PROBES
+            )
+        self.format_selector = FormatSelector(self.config.FORMAT_INDEX_MAX_BYTES)
+        self.warmed = False
         
-    def _get_yt_dlp_options(self, format_selector: str = 'best', enable_subtitles: bool = False) -> Dict[str, Any]:
+    def _get_yt_dlp_options(self, format_selector: Optional[str] = 'best', enable_subtitles: bool = False,
+                            flat_playlist: bool = False) -> Dict[str, Any]:
         """
         Get customized yt-dlp options
         
         Args:
-            format_selector: Format selector
+            format_selector: Format selector, or None to accept any format
+                (the format is then selected locally from the result)
             enable_subtitles: Whether to enable subtitle extraction
+            flat_playlist: Whether to list playlist entries without resolving them
             
         Returns:
             Dict: yt-dlp options
         """
         options = self.config.YT_DLP_OPTIONS.copy()
         
+        # Only resolve the playlist entries we are going to return
+        options['playlist_items'] = f"1-{self.config.MAX_PLAYLIST_SIZE}"
+        if flat_playlist:
+            options['extract_flat'] = 'in_playlist'
+        
         # Set format based on selector
-        if format_selector in self.config.SUPPORTED_FORMATS:
+        if format_selector is None:
+            options['format'] = 'best/bestvideo/bestaudio'
+        elif format_selector in self.config.SUPPORTED_FORMATS:
             if format_selector == 'audio_only':
                 options['format'] = 'bestaudio'
                 options['extractaudio'] = True
@@ -72,6 +214,34 @@ class VideoService:
         
         return options
     
+    def warm(self):
+        """
+        Do the one-time setup work before serving requests
+        
+        Compiles every extractor's URL pattern and builds the pooled yt-dlp
+        instances used by canonical extractions. Call it before forking
+        workers so they share the result instead of each paying for it.
+        """
+        normalize_url('https://warmup.invalid/')
+        for flat_playlist in (False, True):
+            with self.ydl_pool.checkout(self._get_yt_dlp_options(None, True, flat_playlist)):
+                pass
+        self.warmed = True
+    
+    def warm_in_background(self):
+        """
+        Run warm() in a daemon thread so startup does not wait for it
+        """
+        def run():
+            start_time = time.time()
+            try:
+                self.warm()
+                self.logger.info(f"Extraction stack warmed in {time.time() - start_time:.2f}s")
+            except Exception as e:
+                log_error(self.logger, e, 'Error warming the extraction stack')
+        
+        threading.Thread(target=run, daemon=True, name='warmup').start()
+    
     def _validate_url(self, url: str) -> bool:
         """
         Validate the URL (bypassed to allow all non-empty URLs)
@@ -219,6 +389,30 @@ class VideoService:
                 })
         return thumbnails
     
+    def _extract_flat_entry(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Extract the metadata available for an unresolved playlist entry
+        
+        Args:
+            entry: Flat playlist entry from yt-dlp
+            
+        Returns:
+            Dict: Entry information; resolve 'url' with a single-video request
+        """
+        return {
+            'id': entry.get('id', 'unknown'),
+            'title': entry.get('title', 'Unknown Title'),
+            'url': entry.get('url') or entry.get('webpage_url'),
+            'uploader': entry.get('uploader') or entry.get('channel', 'Unknown'),
+            'duration': entry.get('duration'),
+            'duration_formatted': self._format_duration(entry.get('duration')),
+            'view_count': entry.get('view_count'),
+            'thumbnails': self._extract_thumbnails(entry),
+            'extractor_key': entry.get('ie_key'),
+            'formats': [],
+            'resolved': False
+        }
+    
     def _extract_video_info(self, info: Dict[str, Any], include_subtitles: bool = False) -> Dict[str, Any]:
         """
         Extract important video information
@@ -262,264 +456,528 @@ class VideoService:
         
         return video_info
     
-    def get_video_info(self, url: str, format_selector: str = 'best', enable_subtitles: bool = False) -> Dict[str, Any]:
+    def _build_playlist_info(self, info: Dict[str, Any], videos: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
-        Extract video or playlist information
+        Build the playlist part of a result
         
         Args:
-            url: Video or playlist URL
-            format_selector: Desired format selector
-            enable_subtitles: Whether to extract subtitles
+            info: Playlist information from yt-dlp
+            videos: Extracted entries
             
         Returns:
-            Dict: Video or playlist information
+            Dict: Formatted playlist information
         """
-        start_time = time.time()
+        return {
+            'id': info.get('id', 'unknown'),
+            'title': info.get('title', 'Unknown Playlist'),
+            'uploader': info.get('uploader', 'Unknown'),
+            'uploader_id': info.get('uploader_id'),
+            'uploader_url': info.get('uploader_url'),
+            'description': info.get('description', ''),
+            'webpage_url': info.get('webpage_url'),
+            'total_videos': len(videos),
+            'playlist_count': info.get('playlist_count'),
+            'videos': videos
+        }
+    
+    def _error_result(self, url: str, error: Exception, start_time: float) -> Dict[str, Any]:
+        """
+        Log a failed extraction and build its result
         
-        try:
-            if not self._validate_url(url):
-                raise ValueError("Invalid URL format")
-            
-            ydl_opts = self._get_yt_dlp_options(format_selector, enable_subtitles)
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-            
-            is_playlist = 'entries' in info
-            
-            if is_playlist:
-                entries = info.get('entries', [])
-                valid_entries = [entry for entry in entries if entry is not None]
-                
-                if len(valid_entries) > self.config.MAX_PLAYLIST_SIZE:
-                    valid_entries = valid_entries[:self.config.MAX_PLAYLIST_SIZE]
-                    self.logger.warning(f"Playlist limited to {self.config.MAX_PLAYLIST_SIZE} videos")
-                
-                videos = []
-                for entry in valid_entries:
-                    try:
-                        video_info = self._extract_video_info(entry, include_subtitles=enable_subtitles)
-                        videos.append(video_info)
-                    except Exception as e:
-                        self.logger.error(f"Error extracting video info: {str(e)}")
-                        continue
-                
-                result = {
-                    'success': True,
-                    'is_playlist': True,
-                    'playlist': {
-                        'id': info.get('id', 'unknown'),
-                        'title': info.get('title', 'Unknown Playlist'),
-                        'uploader': info.get('uploader', 'Unknown'),
-                        'uploader_id': info.get('uploader_id'),
-                        'uploader_url': info.get('uploader_url'),
-                        'description': info.get('description', ''),
-                        'webpage_url': info.get('webpage_url'),
-                        'total_videos': len(valid_entries),
-                        'videos': videos
-                    }
-                }
-                
-                video_count = len(videos)
-                
-            else:
-                video_info = self._extract_video_info(info, include_subtitles=enable_subtitles)
-                
-                result = {
-                    'success': True,
-                    'is_playlist': False,
-                    'video': video_info
-                }
-                
-                video_count = 1
-            
-            duration = time.time() - start_time
-            log_video_extraction(self.logger, url, True, video_count, duration)
-            
-            return result
+        Args:
+            url: Video or playlist URL
+            error: Exception raised by the extraction
+            start_time: Extraction start time
             
-        except yt_dlp.utils.ExtractorError as e:
-            error_msg = str(e)
+        Returns:
+            Dict: Error result
+        """
+        from yt_dlp.utils import DownloadCancelled, ExtractorError  # Deferred: importing yt-dlp is slow
+        
+        duration = time.time() - start_time
+        log_video_extraction(self.logger, url, False, 0, duration)
+        if isinstance(error, DownloadCancelled):
+            self.logger.warning(f"Extraction of {url} cancelled at the deadline after {duration:.2f}s")
+            return timeout_result()
+        retryable = self._is_retryable_error(str(error))
+        
+        if isinstance(error, ExtractorError):
+            error_msg = str(error)
             if 'video is unavailable' in error_msg.lower():
                 error_msg = 'Video is unavailable'
             elif 'geo-restricted' in error_msg.lower():
                 error_msg = 'Video is geo-restricted'
             elif 'video has been removed' in error_msg.lower():
                 error_msg = 'Video has been removed'
-            duration = time.time() - start_time
-            log_video_extraction(self.logger, url, False, 0, duration)
-            return {
-                'success': False,
-                'error': error_msg
-            }
-        except Exception as e:
-            duration = time.time() - start_time
-            log_video_extraction(self.logger, url, False, 0, duration)
-            log_error(self.logger, e, f"Error extracting video info from {url}")
             return {
                 'success': False,
-                'error': 'An unexpected error occurred',
-                'message': str(e)
+                'error': error_msg,
+                'retryable': retryable
             }
+        
+        log_error(self.logger, error, f"Error extracting video info from {url}")
+        return {
+            'success': False,
+            'error': 'An unexpected error occurred',
+            'message': str(error),
+            'retryable': retryable
+        }
     
-    def get_download_links(self, url: str, format_selector: str = 'best') -> Dict[str, Any]:
+    def _is_retryable_error(self, message: str) -> bool:
         """
-        Extract direct download links
+        Classify an extraction error as transient or permanent
+        
+        Errors about the requested content (unavailable, private, removed,
+        unsupported URL, ...) are permanent, unless the site is only using
+        them to throttle us. Everything else, such as network errors,
+        throttling and extractor breakage, may go away on a retry.
         
         Args:
-            url: Video or playlist URL
-            format_selector: Desired format selector
+            message: Error message
             
         Returns:
-            Dict: Direct download links
+            bool: True if the error is transient
+        """
+        return bool(THROTTLE_PATTERN.search(message)) or not CONTENT_ERROR_PATTERN.search(message)
+    
+    def _missing_info_error(self) -> Exception:
         """
-        info = self.get_video_info(url, format_selector)
+        Build the error for an extraction that returned no information
         
-        if not info['success']:
-            return info
+        With ignoreerrors set, yt-dlp logs the failure and returns None
+        instead of raising, so the logged error is the real cause.
         
-        if info['is_playlist']:
-            download_links = []
-            for video in info['playlist']['videos']:
-                video_links = {
-                    'id': video['id'],
-                    'title': video['title'],
-                    'formats': []
-                }
-                
-                for fmt in video['formats']:
-                    if fmt['url']:
-                        video_links['formats'].append({
-                            'format_id': fmt['format_id'],
-                            'format_note': fmt['format_note'],
-                            'ext': fmt['ext'],
-                            'url': fmt['url'],
-                            'filesize_formatted': fmt['filesize_formatted']
-                        })
-                
-                download_links.append(video_links)
+        Returns:
+            Exception: ExtractorError carrying the logged message
+        """
+        from yt_dlp.utils import ExtractorError  # Deferred: importing yt-dlp is slow
+        
+        message = YTDLPLogger.last_error() or 'No video information could be extracted'
+        return ExtractorError(re.sub(r'^ERROR:\s*', '', message), expected=True)
+    
+    def _site_key(self, url: str) -> str:
+        """Get the key whose concurrency limit and circuit apply to a URL (its extractor)"""
+        try:
+            return normalize_url(url).extractor_key
+        except Exception:
+            return 'Generic'
+    
+    def _is_site_failure(self, result: Dict[str, Any]) -> Optional[bool]:
+        """
+        Decide whether a result says the site or its extractor is failing
+        
+        Args:
+            result: Extraction result
             
-            return {
-                'success': True,
-                'is_playlist': True,
-                'playlist': {
-                    'title': info['playlist']['title'],
-                    'total_videos': info['playlist']['total_videos'],
-                    'videos': download_links
+        Returns:
+            bool: True for transient failures, False for successes and
+                permanent errors about the requested content, None for
+                results that never reached the site
+        """
+        if result.get('success'):
+            return False
+        if result.get('rejected'):
+            return None
+        return result.get('retryable', True)
+    
+    def _acquire_slot(self, url: str,
+                      deadline: Optional[float] = None) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Pass the URL's site circuit breaker and wait for a concurrency slot
+        
+        Args:
+            url: Video or playlist URL
+            deadline: Unix time after which waiting is pointless
+            
+        Returns:
+            tuple: (slot, None) when admitted, (None, error result) when rejected
+        """
+        key = self._site_key(url)
+        slot = {'key': key, 'circuit': None, 'token': None}
+        if self.circuit_breaker is not None:
+            slot['circuit'] = self.circuit_breaker.allow(key)
+            if slot['circuit'] is None:
+                return None, {
+                    'success': False,
+                    'error': 'Extractor temporarily unavailable',
+                    'message': f"{key} extractions are failing, retry in "
+                               f"{max(1, math.ceil(self.circuit_breaker.retry_after(key)))}s",
+                    'rejected': True,
+                    'retryable': True
                 }
-            }
+        if self.concurrency is not None:
+            wait = self.config.ADAPTIVE_CONCURRENCY_WAIT
+            if deadline is not None:
+                wait = max(0.0, min(wait, deadline - time.time()))
+            slot['token'] = self.concurrency.acquire(key, wait)
+            if slot['token'] is None:
+                if slot['circuit'] is not None:
+                    self.circuit_breaker.record(key, slot['circuit'], None)
+                self.logger.warning(f"No {key} extraction slot freed up in time for {url}")
+                return None, {
+                    'success': False,
+                    'error': 'Too many concurrent extractions for this site',
+                    'message': 'The site is throttling requests, try again later',
+                    'rejected': True,
+                    'retryable': True
+                }
+        return slot, None
+    
+    def _release_slot(self, slot: Dict[str, Any], result: Optional[Dict[str, Any]], elapsed: float,
+                      flat_playlist: bool = False, throttled: Optional[int] = None):
+        """
+        Free a concurrency slot and report the extraction's outcome
+        
+        Latency is normalized per returned video so playlists and single
+        videos are comparable. Flat playlists and partial results do not
+        resolve their entries, so they say nothing about a video's latency;
+        they and failures only report throttling.
+        
+        Args:
+            slot: Slot returned by _acquire_slot
+            result: Extraction result, or None if the extraction was abandoned
+            elapsed: Seconds spent extracting
+            flat_playlist: Whether playlist entries were left unresolved
+            throttled: Throttling messages reported by an extraction worker,
+                or None to read those of the current thread
+        """
+        if slot['circuit'] is not None:
+            self.circuit_breaker.record(slot['key'], slot['circuit'],
+                                        None if result is None else not self._is_site_failure(result))
+        if slot['token'] is None:
+            return
+        throttled = (YTDLPLogger.throttled() if throttled is None else throttled) > 0
+        latency = None
+        if result is not None and result.get('success'):
+            if not flat_playlist and not result.get('partial'):
+                videos = result['playlist']['total_videos'] if result.get('is_playlist') else 1
+                latency = elapsed / max(1, videos)
+        elif result is not None:
+            throttled = throttled or bool(THROTTLE_PATTERN.search(f"{result.get('error')} {result.get('message')}"))
+        self.concurrency.release(slot['key'], slot['token'], latency=latency, throttled=throttled)
+    
+    def _deadline(self, deadline: Optional[float]) -> Optional[float]:
+        """Get the deadline of a new extraction: the given one, or REQUEST_TIMEOUT from now"""
+        if deadline is None and self.config.REQUEST_TIMEOUT > 0:
+            return time.time() + self.config.REQUEST_TIMEOUT
+        return deadline
+    
+    def get_video_info(self, url: str, format_selector: Optional[str] = 'best', enable_subtitles: bool = False,
+                       flat_playlist: bool = False, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Extract video or playlist information
+        
+        Runs behind the circuit breaker and within the adaptive concurrency
+        limit of the URL's site, so failing sites fail fast and throttled
+        sites get fewer parallel extractions. Playlists are cut to
+        MAX_PLAYLIST_SIZE entries during extraction, so only the returned
+        entries are resolved.
+        
+        Args:
+            url: Video or playlist URL
+            format_selector: Desired format selector, or None for any format
+            enable_subtitles: Whether to extract subtitles
+            flat_playlist: Whether to return playlist entries unresolved
+            deadline: Unix time by which the extraction is cancelled
+                (defaults to REQUEST_TIMEOUT seconds from now)
             
-        else:
-            video = info['video']
-            download_links = []
+        Returns:
+            Dict: Video or playlist information
+        """
+        result = None
+        for event in self.iter_video_info(url, format_selector, enable_subtitles, flat_playlist, deadline):
+            if event['type'] == 'end':
+                result = event['result']
+        return result
+    
+    def iter_result_events(self, result: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Replay a complete result as iter_video_info events
+        
+        Args:
+            result: Result of get_video_info
             
-            for fmt in video['formats']:
-                if fmt['url']:
-                    download_links.append({
-                        'format_id': fmt['format_id'],
-                        'format_note': fmt['format_note'],
-                        'ext': fmt['ext'],
-                        'url': fmt['url'],
-                        'filesize_formatted': fmt['filesize_formatted']
-                    })
+        Yields:
+            Dict: Extraction events
+        """
+        if result['success'] and result['is_playlist']:
+            playlist = result['playlist']
+            yield {'type': 'playlist', 'playlist': {k: v for k, v in playlist.items() if k != 'videos'}}
+            for index, video in enumerate(playlist['videos']):
+                yield {'type': 'video', 'index': index, 'video': video}
+        elif result['success']:
+            yield {'type': 'video', 'index': 0, 'video': result['video']}
+        yield {'type': 'end', 'success': result['success'], 'result': result}
+    
+    def iter_video_info(self, url: str, format_selector: Optional[str] = 'best', enable_subtitles: bool = False,
+                        flat_playlist: bool = False, deadline: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Extract video or playlist information incrementally, behind the
+        circuit breaker and within the concurrency limit of the URL's site
+        
+        Only time spent extracting counts as latency, not time the
+        consumer takes between events.
+        
+        Args:
+            url: Video or playlist URL
+            format_selector: Desired format selector, or None for any format
+            enable_subtitles: Whether to extract subtitles
+            flat_playlist: Whether to return playlist entries unresolved
+            deadline: Unix time by which the extraction is cancelled
+                (defaults to REQUEST_TIMEOUT seconds from now)
             
-            return {
-                'success': True,
-                'is_playlist': False,
-                'video': {
-                    'id': video['id'],
-                    'title': video['title'],
-                    'duration_formatted': video['duration_formatted'],
-                    'formats': download_links
-                }
-            }
+        Yields:
+            Dict: Extraction events (see _iter_video_info)
+        """
+        deadline = self._deadline(deadline)
+        if self.concurrency is None and self.circuit_breaker is None:
+            for event in self._iter_video_info(url, format_selector, enable_subtitles, flat_playlist, deadline):
+                if event['type'] == 'end':
+                    event.pop('throttled', None)
+                yield event
+            return
+        
+        slot, rejection = self._acquire_slot(url, deadline)
+        if slot is None:
+            yield {'type': 'end', 'success': False, 'result': rejection}
+            return
+        events = self._iter_video_info(url, format_selector, enable_subtitles, flat_playlist, deadline)
+        result = None
+        throttled = None
+        elapsed = 0.0
+        try:
+            while True:
+                start_time = time.time()
+                event = next(events, None)
+                elapsed += time.time() - start_time
+                if event is None:
+                    break
+                if event['type'] == 'end':
+                    result = event['result']
+                    throttled = event.pop('throttled', None)
+                yield event
+        finally:
+            events.close()
+            self._release_slot(slot, result, elapsed, flat_playlist, throttled)
     
-    def get_subtitles(self, url: str) -> Dict[str, Any]:
+    def _iter_video_info(self, url: str, format_selector: Optional[str] = 'best', enable_subtitles: bool = False,
+                         flat_playlist: bool = False, deadline: Optional[float] = None) -> Iterator[Dict[str, Any]]:
         """
-        Extract available subtitle links
+        Extract video or playlist information incrementally
+        
+        Yields a 'playlist' event with the playlist metadata first, then a
+        'video' event for each entry as soon as it is resolved, and finally
+        an 'end' event with the complete result. With an extraction backend
+        the events are streamed from a worker process, and its 'end' event
+        also carries the worker's count of throttling messages.
+        
+        The extraction is cancelled at the deadline: YTDLPLogger aborts
+        yt-dlp at its next log message, and the extraction backend kills
+        workers that overrun it. A playlist then ends with the entries
+        resolved so far and 'partial' set; anything else times out.
         
         Args:
             url: Video or playlist URL
+            format_selector: Desired format selector, or None for any format
+            enable_subtitles: Whether to extract subtitles
+            flat_playlist: Whether to return playlist entries unresolved
+            deadline: Unix time by which the extraction is cancelled, or None
             
-        Returns:
-            Dict: Available subtitles
+        Yields:
+            Dict: Extraction events
         """
-        info = self.get_video_info(url, enable_subtitles=True)
+        if self.extraction_backend is not None:
+            yield from self.extraction_backend.iter_video_info(
+                url, format_selector, enable_subtitles, flat_playlist, deadline
+            )
+            return
         
-        if not info['success']:
-            return info
+        start_time = time.time()
+        YTDLPLogger.reset_signals(deadline)
         
-        if info['is_playlist']:
-            subtitles_list = []
-            for video in info['playlist']['videos']:
-                subtitles_list.append({
-                    'id': video['id'],
-                    'title': video['title'],
-                    'subtitles': video.get('subtitles', {})
-                })
+        try:
+            from yt_dlp.utils import DownloadCancelled  # Deferred: importing yt-dlp is slow
             
-            return {
-                'success': True,
-                'is_playlist': True,
-                'playlist': {
-                    'title': info['playlist']['title'],
-                    'total_videos': info['playlist']['total_videos'],
-                    'videos': subtitles_list
-                }
-            }
+            if not self._validate_url(url):
+                raise ValueError("Invalid URL format")
             
-        else:
-            return {
-                'success': True,
-                'is_playlist': False,
-                'video': {
-                    'id': info['video']['id'],
-                    'title': info['video']['title'],
-                    'subtitles': info['video'].get('subtitles', {})
-                }
-            }
+            ydl_opts = self._get_yt_dlp_options(format_selector, enable_subtitles, flat_playlist)
+            
+            with self.ydl_pool.checkout(ydl_opts) as ydl:
+                # Resolve the top level only; entries are processed one by one below
+                info = ydl.extract_info(url, download=False, process=False)
+                while info and info.get('_type') in ('url', 'url_transparent'):
+                    info = ydl.extract_info(info['url'], download=False, ie_key=info.get('ie_key'), process=False)
+                if not info:
+                    raise self._missing_info_error()
+                
+                if info.get('_type') in ('playlist', 'multi_video'):
+                    videos = []
+                    playlist_info = self._build_playlist_info(info, videos)
+                    yield {'type': 'playlist', 'playlist': {k: v for k, v in playlist_info.items() if k != 'videos'}}
+                    
+                    partial = False
+                    for entry in itertools.islice(info.get('entries') or [], self.config.MAX_PLAYLIST_SIZE):
+                        if deadline is not None and time.time() >= deadline:
+                            partial = True
+                            break
+                        if entry is None:
+                            continue
+                        try:
+                            if flat_playlist:
+                                video_info = self._extract_flat_entry(entry)
+                            else:
+                                resolved = ydl.process_ie_result(entry, download=False)
+                                if resolved is None:
+                                    continue
+                                video_info = self._extract_video_info(resolved, include_subtitles=enable_subtitles)
+                        except DownloadCancelled:
+                            partial = True
+                            break
+                        except Exception as e:
+                            self.logger.error(f"Error extracting video info: {str(e)}")
+                            continue
+                        videos.append(video_info)
+                        yield {'type': 'video', 'index': len(videos) - 1, 'video': video_info}
+                    
+                    result = partial_playlist_result(playlist_info, videos) if partial else {
+                        'success': True,
+                        'is_playlist': True,
+                        'playlist': {**playlist_info, 'total_videos': len(videos)}
+                    }
+                    if partial:
+                        self.logger.warning(f"Playlist {url} cut at the deadline after {len(videos)} videos")
+                    video_count = len(videos)
+                    
+                else:
+                    info = ydl.process_ie_result(info, download=False)
+                    if not info:
+                        raise self._missing_info_error()
+                    video_info = self._extract_video_info(info, include_subtitles=enable_subtitles)
+                    yield {'type': 'video', 'index': 0, 'video': video_info}
+                    result = {
+                        'success': True,
+                        'is_playlist': False,
+                        'video': video_info
+                    }
+                    video_count = 1
+            
+            duration = time.time() - start_time
+            log_video_extraction(self.logger, url, True, video_count, duration)
+            
+        except Exception as e:
+            result = self._error_result(url, e, start_time)
+        finally:
+            YTDLPLogger.clear_deadline()
+        
+        yield {'type': 'end', 'success': result['success'], 'result': result}
     
-    def get_thumbnails(self, url: str) -> Dict[str, Any]:
+    def _format_link(self, fmt: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the download link fields of a format"""
+        return {
+            'format_id': fmt['format_id'],
+            'format_note': fmt['format_note'],
+            'ext': fmt['ext'],
+            'url': fmt['url'],
+            'filesize_formatted': fmt['filesize_formatted']
+        }
+    
+    def _format_links(self, video: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Get the downloadable formats of an extracted video"""
+        return [self._format_link(fmt) for fmt in video['formats'] if fmt['url']]
+    
+    def _view_fields(self, video: Dict[str, Any], view: str, in_playlist: bool) -> List[str]:
+        """Get the video fields an endpoint returns by default"""
+        if view == 'info':
+            return [name for name in video if name != 'subtitles']
+        if view == 'download-links':
+            return ['id', 'title', 'formats'] if in_playlist else ['id', 'title', 'duration_formatted', 'formats']
+        return ['id', 'title', view]
+    
+    def project_video(self, video: Dict[str, Any], view: str, in_playlist: bool = False,
+                      format_selector: Optional[str] = None,
+                      fields: Optional[Collection[str]] = None) -> Dict[str, Any]:
         """
-        Extract available thumbnail links
+        Project an extracted video onto the fields of one endpoint
+        
+        Only the requested fields are built, so a client asking for a
+        title and the selected link never pays for the format list.
         
         Args:
-            url: Video or playlist URL
+            video: Video from a get_video_info result
+            view: 'info', 'download-links', 'subtitles' or 'thumbnails'
+            in_playlist: Whether the video is a playlist entry
+            format_selector: Selector evaluated locally over the video's
+                formats; the match is returned as 'selected_format'
+            fields: Sparse fieldset; 'id' is always included
             
         Returns:
-            Dict: Available thumbnails
+            Dict: Projected video
+        """
+        names = self._view_fields(video, view, in_playlist)
+        if format_selector and view in ('info', 'download-links'):
+            names.append('selected_format')
+        if fields is not None:
+            names = [name for name in names if name == 'id' or name in fields]
+        
+        projected = {}
+        for name in names:
+            if name == 'selected_format':
+                selected = self.format_selector.select(video['formats'], format_selector)
+                if view == 'download-links':
+                    selected = self._format_link(selected) if selected and selected['url'] else None
+                projected[name] = selected
+            elif name == 'formats' and view == 'download-links':
+                projected[name] = self._format_links(video)
+            elif name == 'subtitles':
+                projected[name] = video.get('subtitles', {})
+            elif name == 'thumbnails':
+                projected[name] = video.get('thumbnails', [])
+            else:
+                projected[name] = video.get(name)
+        return projected
+    
+    def project(self, info: Dict[str, Any], view: str, format_selector: Optional[str] = None,
+                fields: Optional[Collection[str]] = None) -> Dict[str, Any]:
         """
-        info = self.get_video_info(url)
+        Project a complete extraction result onto the response of one endpoint
+        
+        A single extraction with subtitles enabled serves every endpoint;
+        the projection only copies the fields the endpoint returns. Format
+        selectors are evaluated locally, so the same cached result answers
+        every selector.
         
+        Args:
+            info: Result of get_video_info with enable_subtitles=True
+            view: 'info', 'download-links', 'subtitles' or 'thumbnails'
+            format_selector: Optional selector from SUPPORTED_FORMATS
+            fields: Optional sparse fieldset applied to every video
+            
+        Returns:
+            Dict: Endpoint result
+        """
         if not info['success']:
             return info
+        if fields is not None:
+            fields = set(fields)
         
         if info['is_playlist']:
-            thumbnails_list = []
-            for video in info['playlist']['videos']:
-                thumbnails_list.append({
-                    'id': video['id'],
-                    'title': video['title'],
-                    'thumbnails': video.get('thumbnails', [])
-                })
-            
-            return {
-                'success': True,
-                'is_playlist': True,
-                'playlist': {
-                    'title': info['playlist']['title'],
-                    'total_videos': info['playlist']['total_videos'],
-                    'videos': thumbnails_list
-                }
-            }
-            
-        else:
-            return {
-                'success': True,
-                'is_playlist': False,
-                'video': {
-                    'id': info['video']['id'],
-                    'title': info['video']['title'],
-                    'thumbnails': info['video'].get('thumbnails', [])
-                }
-            }
\ No newline at end of file
+            playlist = info['playlist']
+            videos = [
+                self.project_video(video, view, True, format_selector, fields)
+                for video in playlist['videos']
+            ]
+            if view == 'info':
+                playlist = {**playlist, 'videos': videos}
+            else:
+                playlist = {'title': playlist['title'], 'total_videos': playlist['total_videos'], 'videos': videos}
+            result = {'success': True, 'is_playlist': True, 'playlist': playlist}
+            if info.get('partial'):
+                result['partial'] = True
+            return result
+        
+        return {
+            'success': True,
+            'is_playlist': False,
+            'video': self.project_video(info['video'], view, False, format_selector, fields)
+        }
\ No newline at end of file
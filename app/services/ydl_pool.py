@@ -0,0 +1,120 @@
+"""
+Pool of reusable, pre-initialized yt-dlp instances
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Tuple
+
+if TYPE_CHECKING:
+    import yt_dlp
+
+class YoutubeDLPool:
+    """
+    Reuse YoutubeDL instances across extractions
+    
+    Building a YoutubeDL re-runs option processing, extractor registration
+    and HTTP opener setup; reused instances also keep their extractor
+    instances (and whatever those cache, such as player code) warm.
+    Instances are keyed by their option set, used by one extraction at a
+    time, and closed after a fixed number of uses.
+    """
+    
+    def __init__(self, max_idle: int, max_uses: int):
+        """
+        Initialize the pool
+        
+        Args:
+            max_idle: Maximum number of idle instances kept per option set
+            max_uses: Number of extractions after which an instance is closed
+        """
+        self.max_idle = max_idle
+        self.max_uses = max_uses
+        self._idle: Dict[str, List[Tuple['yt_dlp.YoutubeDL', int]]] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+        self.retired = 0
+    
+    def _options_key(self, options: Dict[str, Any]) -> str:
+        """Build a stable key for an option set, ignoring the logger object"""
+        return repr(sorted((name, value) for name, value in options.items() if name != 'logger'))
+    
+    @contextmanager
+    def checkout(self, options: Dict[str, Any]) -> Iterator['yt_dlp.YoutubeDL']:
+        """
+        Borrow an instance configured with the given options
+        
+        The instance goes back to the pool when the block exits normally
+        and is discarded if the block raises.
+        
+        Args:
+            options: yt-dlp options
+            
+        Yields:
+            yt_dlp.YoutubeDL: Instance reserved for the caller
+        """
+        key = self._options_key(options)
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if idle:
+                ydl, uses = idle.pop()
+                self.reused += 1
+            else:
+                ydl, uses = None, 0
+        
+        if ydl is None:
+            from yt_dlp import YoutubeDL  # Deferred: importing yt-dlp is slow
+            
+            ydl = YoutubeDL(options)
+            with self._lock:
+                self.created += 1
+        
+        healthy = False
+        try:
+            yield ydl
+            healthy = True
+        finally:
+            uses += 1
+            keep = False
+            if healthy and uses < self.max_uses:
+                with self._lock:
+                    if len(idle) < self.max_idle:
+                        idle.append((ydl, uses))
+                        keep = True
+            if not keep:
+                self._retire(ydl)
+    
+    def _retire(self, ydl: 'yt_dlp.YoutubeDL'):
+        """Close an instance that leaves the pool"""
+        with self._lock:
+            self.retired += 1
+        try:
+            ydl.close()
+        except Exception:
+            pass
+    
+    def clear(self):
+        """
+        Close all idle instances
+        """
+        with self._lock:
+            idle = [ydl for instances in self._idle.values() for ydl, _ in instances]
+            self._idle.clear()
+        for ydl in idle:
+            self._retire(ydl)
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get pool counters
+        
+        Returns:
+            Dict: Idle, created, reused and retired instance counts
+        """
+        with self._lock:
+            return {
+                'idle': sum(len(instances) for instances in self._idle.values()),
+                'created': self.created,
+                'reused': self.reused,
+                'retired': self.retired
+            }
\ No newline at end of file
@@ -0,0 +1,155 @@
+"""
+Adaptive (AIMD) concurrency limits per key
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+class _KeyState:
+    """Limit and counters of one key"""
+    __slots__ = ('limit', 'in_flight', 'waiting', 'samples', 'baseline', 'decreases', 'completed', 'throttled')
+    
+    def __init__(self, limit: float, window: int):
+        self.limit = limit
+        self.in_flight = 0
+        self.waiting = 0
+        self.samples: Deque[Tuple[float, float]] = deque(maxlen=window)  # Recent (time, latency) pairs
+        self.baseline: Optional[float] = None  # Latency seen when the site is not congested
+        self.decreases = 0
+        self.completed = 0
+        self.throttled = 0
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Concurrency limit per key that adapts with additive increase /
+    multiplicative decrease
+    
+    Every completion that used the whole limit without congestion raises
+    the limit by 1/limit (about +1 per limit's worth of completions).
+    A throttling signal, or a latency above `latency_tolerance` times the
+    uncongested baseline, multiplies it by `backoff`. The baseline is a low
+    percentile of the latencies of the last `baseline_horizon` seconds (at
+    most `baseline_window` of them), so a few unusually fast samples cannot
+    pin it down and a lasting change of the site's speed is picked up
+    within the horizon. Like TCP, at most one
+    decrease is applied per window: completions of slots acquired before
+    the last decrease do not decrease again.
+    """
+    
+    # Latencies needed before the baseline is trusted
+    MIN_SAMPLES = 20
+    
+    def __init__(self, initial: int, min_limit: int, max_limit: int,
+                 latency_tolerance: float = 3.0, backoff: float = 0.5, baseline_window: int = 500,
+                 baseline_horizon: float = 300.0, baseline_percentile: float = 0.1):
+        """
+        Initialize the limiter
+        
+        Args:
+            initial: Starting limit of a new key
+            min_limit: Lowest limit a key can be decreased to
+            max_limit: Highest limit a key can grow to
+            latency_tolerance: Latency multiple of the baseline treated as congestion
+            backoff: Factor applied to the limit on congestion
+            baseline_window: Maximum number of recent latencies the baseline is taken from
+            baseline_horizon: Seconds after which a latency no longer counts
+            baseline_percentile: Percentile of those latencies used as the baseline
+        """
+        self.initial = float(initial)
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max_limit)
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+        self.baseline_window = baseline_window
+        self.baseline_horizon = baseline_horizon
+        self.baseline_percentile = baseline_percentile
+        self._states: Dict[str, _KeyState] = {}
+        self._condition = threading.Condition()
+    
+    def acquire(self, key: str, timeout: Optional[float] = None) -> Optional[int]:
+        """
+        Wait for a free slot of a key
+        
+        Args:
+            key: Limited key (e.g. an extractor key)
+            timeout: Seconds to wait, or None to wait indefinitely
+            
+        Returns:
+            int: Token to pass to release(), or None if the timeout expired
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            state = self._states.get(key)
+            if state is None:
+                state = self._states[key] = _KeyState(self.initial, self.baseline_window)
+            state.waiting += 1
+            try:
+                while state.in_flight >= int(state.limit):
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return None
+                    self._condition.wait(remaining)
+            finally:
+                state.waiting -= 1
+            state.in_flight += 1
+            return state.decreases
+    
+    def release(self, key: str, token: int, latency: Optional[float] = None, throttled: bool = False):
+        """
+        Free a slot and adapt the key's limit to its outcome
+        
+        Args:
+            key: Limited key
+            token: Value returned by acquire()
+            latency: Duration of the work, or None if it says nothing about congestion
+            throttled: Whether the work hit a throttling signal
+        """
+        with self._condition:
+            state = self._states[key]
+            saturated = state.in_flight >= int(state.limit)
+            state.in_flight -= 1
+            state.completed += 1
+            
+            congested = throttled
+            if throttled:
+                state.throttled += 1
+            elif latency is not None:
+                now = time.monotonic()
+                while state.samples and state.samples[0][0] < now - self.baseline_horizon:
+                    state.samples.popleft()
+                if len(state.samples) >= self.MIN_SAMPLES:
+                    congested = latency > state.baseline * self.latency_tolerance
+                state.samples.append((now, latency))
+                ordered = sorted(sample for _, sample in state.samples)
+                state.baseline = ordered[int((len(ordered) - 1) * self.baseline_percentile)]
+            
+            if congested:
+                if token == state.decreases:
+                    state.limit = max(self.min_limit, state.limit * self.backoff)
+                    state.decreases += 1
+            elif saturated:
+                state.limit = min(self.max_limit, state.limit + 1 / state.limit)
+            self._condition.notify_all()
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the limit and counters of every key
+        
+        Returns:
+            Dict: Per-key limit, in-flight, waiting, completed, throttled and decrease counts
+        """
+        with self._condition:
+            return {
+                key: {
+                    'limit': int(state.limit),
+                    'in_flight': state.in_flight,
+                    'waiting': state.waiting,
+                    'completed': state.completed,
+                    'throttled': state.throttled,
+                    'decreases': state.decreases,
+                    'baseline_latency': round(state.baseline, 3) if state.baseline is not None else None
+                }
+                for key, state in self._states.items()
+            }
\ No newline at end of file
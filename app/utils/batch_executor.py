@@ -0,0 +1,118 @@
+"""
+Bounded parallel execution of multi-URL batches
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+class BatchExecutor:
+    """
+    Shared worker pool that runs batch items concurrently
+    
+    The pool bounds the total number of extractions in flight across all
+    requests, while each batch limits how many of its own calls, including
+    ones it stopped waiting for, it keeps submitted at a time.
+    """
+    
+    def __init__(self, max_workers: int):
+        """
+        Initialize the executor
+        
+        Args:
+            max_workers: Size of the shared worker pool
+        """
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='batch')
+        self.timeouts = 0
+    
+    def iter_completed(self, fn: Callable[[Any], Any], items: Sequence[Any], concurrency: int, timeout: float,
+                       on_timeout: Callable[[Any], Any],
+                       on_error: Callable[[Any, Exception], Any]) -> Iterator[Tuple[int, Any]]:
+        """
+        Apply fn to every item in parallel, yielding results as they complete
+        
+        An item that misses its deadline is reported with on_timeout, but
+        its call keeps running in the shared pool, so it still counts
+        against the batch's concurrency until it returns.
+        
+        Args:
+            fn: Function to apply to each item
+            items: Batch items
+            concurrency: Maximum number of this batch's calls in flight
+            timeout: Per-item deadline in seconds, counted from when the call starts running
+            on_timeout: Produces the result for an item that missed its deadline
+            on_error: Produces the result for an item whose call raised
+            
+        Yields:
+            Tuple: (item index, result) in completion order
+        """
+        pending: Dict[Any, Tuple[int, List[float]]] = {}
+        abandoned = set()
+        next_index = 0
+        concurrency = max(1, concurrency)
+        
+        def run(item: Any, started: List[float]) -> Any:
+            started.append(time.monotonic())
+            return fn(item)
+        
+        try:
+            while next_index < len(items) or pending:
+                abandoned = {future for future in abandoned if not future.done()}
+                while next_index < len(items) and len(pending) + len(abandoned) < concurrency:
+                    started: List[float] = []
+                    future = self._pool.submit(run, items[next_index], started)
+                    pending[future] = (next_index, started)
+                    next_index += 1
+                
+                # Calls still queued in the pool have no deadline yet; look again
+                # within `timeout` in case they start in the meantime
+                now = time.monotonic()
+                nearest_deadline = min([started[0] + timeout for _, started in pending.values() if started]
+                                       + [now + timeout])
+                done, _ = wait(set(pending) | abandoned, timeout=max(0.0, nearest_deadline - now),
+                               return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    if future not in pending:
+                        continue
+                    index, _ = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = on_error(items[index], e)
+                    yield index, result
+                
+                now = time.monotonic()
+                for future, (index, started) in list(pending.items()):
+                    if started and started[0] + timeout <= now and not future.done():
+                        # The call keeps running in its worker; we only stop waiting for it
+                        del pending[future]
+                        abandoned.add(future)
+                        self.timeouts += 1
+                        yield index, on_timeout(items[index])
+        finally:
+            # Abandoned (e.g. disconnected stream): drop work that has not started
+            for future in pending:
+                future.cancel()
+    
+    def map(self, fn: Callable[[Any], Any], items: Sequence[Any], concurrency: int, timeout: float,
+            on_timeout: Callable[[Any], Any], on_error: Callable[[Any, Exception], Any]) -> List[Any]:
+        """
+        Apply fn to every item in parallel and return results in input order
+        
+        Args:
+            fn: Function to apply to each item
+            items: Batch items
+            concurrency: Maximum number of this batch's calls in flight
+            timeout: Per-item deadline in seconds, counted from when the call starts running
+            on_timeout: Produces the result for an item that missed its deadline
+            on_error: Produces the result for an item whose call raised
+            
+        Returns:
+            List: One result per item, in input order
+        """
+        results: List[Any] = [None] * len(items)
+        for index, result in self.iter_completed(fn, items, concurrency, timeout, on_timeout, on_error):
+            results[index] = result
+        return results
\ No newline at end of file
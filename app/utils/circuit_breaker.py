@@ -0,0 +1,161 @@
+"""
+Circuit breakers per key
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class _Circuit:
+    """State of one key's circuit"""
+    __slots__ = ('state', 'outcomes', 'opened_at', 'probes', 'probe_successes', 'opened', 'rejected')
+    
+    def __init__(self, window: int):
+        self.state = CLOSED
+        self.outcomes: Deque[bool] = deque(maxlen=window)  # True for failures
+        self.opened_at = 0.0
+        self.probes = 0
+        self.probe_successes = 0
+        self.opened = 0
+        self.rejected = 0
+
+class CircuitBreaker:
+    """
+    Fail fast for keys whose calls keep failing
+    
+    A circuit opens once at least `min_calls` of the last `window` calls
+    were recorded and `failure_rate` of them failed. While open, calls are
+    rejected; after `open_seconds` it turns half-open and admits up to
+    `probes` trial calls at a time. That many successful trials close it,
+    any failed trial opens it again.
+    """
+    
+    def __init__(self, failure_rate: float, window: int, min_calls: int, open_seconds: float, probes: int = 1):
+        """
+        Initialize the breaker
+        
+        Args:
+            failure_rate: Share of failed calls that opens a circuit
+            window: Number of recent calls the failure rate is computed over
+            min_calls: Calls needed in the window before a circuit can open
+            open_seconds: Seconds a circuit stays open before probing
+            probes: Concurrent trial calls while half-open, and successes needed to close
+        """
+        self.failure_rate = failure_rate
+        self.window = window
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.probes = probes
+        self._circuits: Dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+    
+    def allow(self, key: str) -> Optional[str]:
+        """
+        Ask whether a call for a key may proceed
+        
+        Args:
+            key: Protected key (e.g. an extractor key)
+            
+        Returns:
+            str: State the call was admitted in, to pass to record(), or None if rejected
+        """
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None:
+                circuit = self._circuits[key] = _Circuit(self.window)
+            if circuit.state == OPEN:
+                if time.monotonic() < circuit.opened_at + self.open_seconds:
+                    circuit.rejected += 1
+                    return None
+                circuit.state = HALF_OPEN
+                circuit.probes = 0
+                circuit.probe_successes = 0
+            if circuit.state == HALF_OPEN:
+                if circuit.probes >= self.probes:
+                    circuit.rejected += 1
+                    return None
+                circuit.probes += 1
+            return circuit.state
+    
+    def record(self, key: str, admitted: str, success: Optional[bool]):
+        """
+        Record the outcome of an admitted call
+        
+        Args:
+            key: Protected key
+            admitted: Value returned by allow()
+            success: Whether the call succeeded, or None if it says nothing about the key's health
+        """
+        with self._lock:
+            circuit = self._circuits[key]
+            if admitted == HALF_OPEN:
+                if circuit.state != HALF_OPEN:
+                    return
+                circuit.probes -= 1
+                if success is None:
+                    return
+                if not success:
+                    self._open(circuit)
+                    return
+                circuit.probe_successes += 1
+                if circuit.probe_successes >= self.probes:
+                    circuit.state = CLOSED
+                    circuit.outcomes.clear()
+                return
+            
+            if success is None or circuit.state != CLOSED:
+                return
+            circuit.outcomes.append(not success)
+            if len(circuit.outcomes) >= self.min_calls and \
+                    sum(circuit.outcomes) >= self.failure_rate * len(circuit.outcomes):
+                self._open(circuit)
+    
+    def _open(self, circuit: _Circuit):
+        """Open a circuit (lock held)"""
+        circuit.state = OPEN
+        circuit.opened_at = time.monotonic()
+        circuit.opened += 1
+        circuit.outcomes.clear()
+    
+    def retry_after(self, key: str) -> float:
+        """
+        Get the seconds until an open circuit admits a trial call
+        
+        Args:
+            key: Protected key
+            
+        Returns:
+            float: Seconds to wait, 0.0 if the circuit is not open
+        """
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None or circuit.state != OPEN:
+                return 0.0
+            return max(0.0, circuit.opened_at + self.open_seconds - time.monotonic())
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the state of every circuit
+        
+        Returns:
+            Dict: Per-key state, recent failure rate and counters
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                key: {
+                    'state': circuit.state,
+                    'recent_calls': len(circuit.outcomes),
+                    'failure_rate': round(sum(circuit.outcomes) / len(circuit.outcomes), 3) if circuit.outcomes else 0.0,
+                    'opened': circuit.opened,
+                    'rejected': circuit.rejected,
+                    'retry_after': round(max(0.0, circuit.opened_at + self.open_seconds - now), 1)
+                    if circuit.state == OPEN else 0.0
+                }
+                for key, circuit in self._circuits.items()
+            }
\ No newline at end of file
@@ -0,0 +1,108 @@
+"""
+Compact binary encoding of cached payloads and responses
+"""
+
+import json
+import zlib
+from typing import Any, Tuple
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+CODECS = ('json', 'zlib', 'zstd')
+
+def dumps(data: Any) -> bytes:
+    """
+    Serialize data as compact UTF-8 JSON, with orjson when it is installed
+    
+    Args:
+        data: JSON-serializable data
+        
+    Returns:
+        bytes: Encoded JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; the standard encoder handles them
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def loads(data: bytes) -> Any:
+    """
+    Parse JSON, with orjson when it is installed
+    
+    Args:
+        data: Encoded JSON
+        
+    Returns:
+        Any: Decoded data
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider producing compact JSON through dumps()"""
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps(obj).decode('utf-8')
+    
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any):
+        return self._app.response_class(dumps(self._prepare_response_obj(args, kwargs)) + b'\n',
+                                        mimetype=self.mimetype)
+
+def encode_payload(data: Any, codec: str = 'zlib') -> Tuple[str, bytes]:
+    """
+    Serialize data as compact JSON and compress it
+    
+    Falls back to zlib when zstd is requested but the zstandard package
+    is not installed.
+    
+    Args:
+        data: JSON-serializable data
+        codec: 'json' (uncompressed), 'zlib' or 'zstd'
+        
+    Returns:
+        Tuple: (codec actually used, encoded bytes)
+    """
+    raw = dumps(data)
+    if codec == 'zstd' and zstandard is not None:
+        return 'zstd', zstandard.ZstdCompressor(level=6).compress(raw)
+    if codec in ('zlib', 'zstd'):
+        return 'zlib', zlib.compress(raw, 6)
+    return 'json', raw
+
+def decode_payload(codec: str, payload: bytes) -> Any:
+    """
+    Decode data produced by encode_payload
+    
+    Args:
+        codec: Codec recorded with the payload
+        payload: Encoded bytes
+        
+    Returns:
+        Any: Decoded data
+    """
+    if codec == 'zstd':
+        if zstandard is None:
+            raise ValueError('zstd payload found but the zstandard package is not installed')
+        payload = zstandard.ZstdDecompressor().decompress(payload)
+    elif codec == 'zlib':
+        payload = zlib.decompress(payload)
+    return loads(payload)
\ No newline at end of file
@@ -0,0 +1,219 @@
+"""
+Local evaluation of format selectors over extracted format lists
+"""
+
+import bisect
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Extensions yt-dlp accepts as bare selectors; anything else is a format id
+AUDIO_EXTENSIONS = {'mka', 'mp3', 'ogg', 'wav', 'm4a', 'opus', 'aiff', 'flac', 'alac'}
+VIDEO_EXTENSIONS = {'mov', 'avi', 'mp4', '3gp', 'webm', 'flv', 'mkv'}
+
+RESOLUTION_PATTERN = re.compile(r'^(\d+)p$')
+HEIGHT_PATTERN = re.compile(r'(?:\d+x(\d+)|(\d+)p)')
+
+def _format_height(fmt: Dict[str, Any]) -> Optional[int]:
+    """Get the height of a format from its resolution, e.g. '1280x720' or '720p'"""
+    if fmt.get('height'):
+        return fmt['height']
+    match = HEIGHT_PATTERN.search(str(fmt.get('resolution') or ''))
+    if not match:
+        return None
+    return int(match.group(1) or match.group(2))
+
+class FormatIndex:
+    """
+    Index of one video's formats for answering SUPPORTED_FORMATS selectors
+    
+    Formats are expected in yt-dlp's order, worst to best, so the last
+    match of a selector is the best one. Selectors follow yt-dlp's
+    semantics: 'best' and 'worst' need audio and video (falling back to
+    any format when the video only has video-only or audio-only formats),
+    'bestvideo' and 'bestaudio' only match video-only and audio-only
+    formats, '720p' means 'best[height<=720]' and a bare extension picks
+    the best format in that container.
+    """
+    
+    def __init__(self, formats: List[Dict[str, Any]]):
+        """
+        Build the index
+        
+        Args:
+            formats: Formats of a video, as produced by VideoService
+        """
+        self.formats = formats
+        self.combined: List[int] = []
+        self.video_only: List[int] = []
+        self.audio_only: List[int] = []
+        self.by_ext: Dict[str, List[int]] = {}
+        self.video_only_by_ext: Dict[str, List[int]] = {}
+        self.by_id: Dict[str, int] = {}
+        
+        sized = []
+        sized_partial = []
+        for position, fmt in enumerate(formats):
+            has_video = fmt.get('vcodec') != 'none'
+            has_audio = fmt.get('acodec') != 'none'
+            ext = fmt.get('ext')
+            self.by_id[fmt.get('format_id')] = position
+            
+            if has_video and has_audio:
+                self.combined.append(position)
+                height = _format_height(fmt)
+                if height is not None:
+                    sized.append((height, position))
+            elif has_video:
+                self.video_only.append(position)
+                height = _format_height(fmt)
+                if height is not None:
+                    sized_partial.append((height, position))
+                if ext in VIDEO_EXTENSIONS:
+                    self.video_only_by_ext.setdefault(ext, []).append(position)
+            elif has_audio:
+                self.audio_only.append(position)
+            
+            if (ext in AUDIO_EXTENSIONS and has_audio) or (ext in VIDEO_EXTENSIONS and has_video and has_audio):
+                self.by_ext.setdefault(ext, []).append(position)
+        
+        # yt-dlp lets 'best' and 'worst' fall back to partial formats only
+        # when no format has video or no format has audio
+        self.incomplete = bool(formats) and (
+            all(fmt.get('vcodec') == 'none' for fmt in formats)
+            or all(fmt.get('acodec') == 'none' for fmt in formats)
+        )
+        self.playable = self.video_only + self.audio_only
+        self.playable.sort()
+        
+        # Formats by height, with the best position among all formats up to each height
+        if self.incomplete:
+            sized = sized_partial
+        sized.sort()
+        self.heights = [height for height, _ in sized]
+        self.best_up_to_height: List[int] = []
+        for _, position in sized:
+            best = self.best_up_to_height[-1] if self.best_up_to_height else -1
+            self.best_up_to_height.append(max(best, position))
+    
+    def select(self, selector: str) -> Optional[Dict[str, Any]]:
+        """
+        Pick the format a selector resolves to
+        
+        Args:
+            selector: A SUPPORTED_FORMATS entry or a format id
+            
+        Returns:
+            Dict: Selected format, or None if no format matches
+        """
+        position = self._select_position(selector)
+        return self.formats[position] if position is not None else None
+    
+    def _select_position(self, selector: str) -> Optional[int]:
+        """Pick the position of the format a selector resolves to"""
+        if selector in ('best', 'worst'):
+            candidates = self.combined or (self.playable if self.incomplete else [])
+            if not candidates:
+                return None
+            return candidates[-1] if selector == 'best' else candidates[0]
+        
+        candidates = {
+            'bestvideo': self.video_only,
+            'worstvideo': self.video_only,
+            'bestaudio': self.audio_only,
+            'worstaudio': self.audio_only
+        }.get(selector)
+        if candidates is not None:
+            if not candidates:
+                return None
+            return candidates[0] if selector.startswith('worst') else candidates[-1]
+        
+        match = RESOLUTION_PATTERN.match(selector)
+        if match:
+            count = bisect.bisect_right(self.heights, int(match.group(1)))
+            return self.best_up_to_height[count - 1] if count else None
+        
+        if selector in self.by_ext:
+            return self.by_ext[selector][-1]
+        if selector in self.video_only_by_ext:
+            return self.video_only_by_ext[selector][-1]
+        if selector in AUDIO_EXTENSIONS or selector in VIDEO_EXTENSIONS:
+            return None
+        return self.by_id.get(selector)
+
+def _formats_size(formats: List[Dict[str, Any]]) -> int:
+    """Estimate the memory held by a format list: its strings plus per-dict overhead"""
+    size = 64 + 8 * len(formats)
+    for fmt in formats:
+        size += 232 + sum(len(value) for value in fmt.values() if isinstance(value, str)) + 64 * len(fmt)
+    return size
+
+class FormatSelector:
+    """
+    Selects formats from cached format lists, reusing their indexes
+    
+    Indexes are kept per format list object. Cached results are shared
+    between requests, so every selector after the first one on a cached
+    video is answered from the existing index. Each index keeps its list
+    alive, so indexes are bounded by the estimated size of their lists,
+    and lists evicted from the result cache do not linger past that.
+    """
+    
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        """
+        Initialize the selector
+        
+        Args:
+            max_bytes: Estimated size of the indexed format lists to keep
+        """
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._indexes: 'OrderedDict[int, Tuple[List[Dict[str, Any]], FormatIndex, int]]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def index(self, formats: List[Dict[str, Any]]) -> FormatIndex:
+        """
+        Get the index of a format list, building it on first use
+        
+        Args:
+            formats: Formats of a video
+            
+        Returns:
+            FormatIndex: Index of the list
+        """
+        key = id(formats)
+        with self._lock:
+            entry = self._indexes.get(key)
+            # The list is held by the entry, so its id cannot be reused while cached
+            if entry is not None and entry[0] is formats:
+                self._indexes.move_to_end(key)
+                return entry[1]
+        
+        index = FormatIndex(formats)
+        size = _formats_size(formats)
+        if size > self.max_bytes:
+            return index
+        with self._lock:
+            previous = self._indexes.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[2]
+            self._indexes[key] = (formats, index, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, _, evicted_size) = self._indexes.popitem(last=False)
+                self.bytes -= evicted_size
+        return index
+    
+    def select(self, formats: List[Dict[str, Any]], selector: str) -> Optional[Dict[str, Any]]:
+        """
+        Pick the format a selector resolves to
+        
+        Args:
+            formats: Formats of a video
+            selector: A SUPPORTED_FORMATS entry or a format id
+            
+        Returns:
+            Dict: Selected format, or None if no format matches
+        """
+        return self.index(formats).select(selector)
\ No newline at end of file
@@ -0,0 +1,180 @@
+"""
+Bounded in-process cache for parsed extraction results
+"""
+
+import heapq
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+class MemoryCache:
+    """
+    LRU cache bounded by the total size of its values in bytes
+    
+    Every entry carries an absolute expiry time. Expired entries are
+    kept for `stale_grace` seconds for callers that accept stale values,
+    dropped on access after that, and are the first to go when the cache
+    is over budget; only then are least recently used entries evicted.
+    Values are shared between callers and must be treated as read-only.
+    """
+    
+    def __init__(self, max_bytes: int, stale_grace: float = 0.0):
+        """
+        Initialize the cache
+        
+        Args:
+            max_bytes: Upper bound for the summed size of all entries
+            stale_grace: Seconds expired entries stay available to get_entry(max_stale=...)
+        """
+        self.max_bytes = max_bytes
+        self.stale_grace = stale_grace
+        self._entries: 'OrderedDict[str, Tuple[Any, float, int]]' = OrderedDict()
+        self._entry_hits: Dict[str, int] = {}
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a live value and mark it as recently used
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Any: Cached value, or None on a miss
+        """
+        entry = self.get_entry(key)
+        return entry[0] if entry is not None else None
+    
+    def get_entry(self, key: str, max_stale: float = 0.0) -> Optional[Tuple[Any, float, int]]:
+        """
+        Get a value with its expiry time and mark it as recently used
+        
+        Args:
+            key: Cache key
+            max_stale: Seconds past its expiry a value is still accepted
+                (at most stale_grace)
+            
+        Returns:
+            Tuple: (value, expiry time, hits of this entry), or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            now = time.time()
+            if entry[1] + max_stale <= now:
+                if entry[1] + self.stale_grace <= now:
+                    self._remove(key)
+                    self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            hits = self._entry_hits[key] = self._entry_hits.get(key, 0) + 1
+            return entry[0], entry[1], hits
+    
+    def peek_expiry(self, key: str) -> Optional[float]:
+        """
+        Get the expiry time of an entry without counting a lookup
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            float: Expiry time, or None if the key is not cached
+        """
+        entry = self._entries.get(key)
+        return entry[1] if entry is not None else None
+    
+    def set(self, key: str, value: Any, expires_at: float, size: Optional[int] = None):
+        """
+        Store a value until the given unix time
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+            expires_at: Unix timestamp after which the entry is dead
+            size: Size of the value in bytes (defaults to its JSON length)
+        """
+        now = time.time()
+        if expires_at + self.stale_grace <= now:
+            return
+        if size is None:
+            size = len(json.dumps(value))
+        if size > self.max_bytes:
+            return
+        
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires_at, size)
+            self._bytes += size
+            heapq.heappush(self._expiry_heap, (expires_at, key))
+            self._evict(now)
+            
+            # Replaced entries leave stale heap items behind; rebuild occasionally
+            if len(self._expiry_heap) > 2 * len(self._entries) + 64:
+                self._expiry_heap = [(entry[1], k) for k, entry in self._entries.items()]
+                heapq.heapify(self._expiry_heap)
+    
+    def delete(self, key: str):
+        """
+        Remove an entry if present
+        
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+    
+    def _remove(self, key: str):
+        """Remove an entry; the caller must hold the lock"""
+        _, _, size = self._entries.pop(key)
+        self._entry_hits.pop(key, None)
+        self._bytes -= size
+    
+    def _evict(self, now: float):
+        """Shrink the cache below max_bytes; the caller must hold the lock"""
+        # Expired entries go first, in expiry order
+        while self._bytes > self.max_bytes and self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expiry_heap)
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == expires_at:
+                self._remove(key)
+                self.expirations += 1
+        
+        # Then the least recently used ones
+        while self._bytes > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters
+        
+        Returns:
+            Dict: Hit, miss, eviction and size counters
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
\ No newline at end of file
@@ -0,0 +1,122 @@
+"""
+Coalescing of concurrent identical calls within one process
+"""
+
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+class _Call:
+    """An in-flight call shared by its leader and followers"""
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """
+    Run at most one call per key at a time
+    
+    The first caller for a key executes the function; callers arriving
+    while it runs block and receive the same result (or exception).
+    Callers that cannot wrap their work in a function, such as streamed
+    extractions, lead and follow calls with join(), finish() and wait().
+    """
+    
+    def __init__(self):
+        """
+        Initialize the coordinator
+        """
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.executed = 0
+        self.coalesced = 0
+    
+    def join(self, key: str) -> Tuple[_Call, bool]:
+        """
+        Join the in-flight call of a key, or start one
+        
+        A caller that becomes the leader must pass its outcome to finish().
+        
+        Args:
+            key: Identity of the call
+            
+        Returns:
+            Tuple: (call, whether the caller leads it)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                return call, True
+            self.coalesced += 1
+            return call, False
+    
+    def finish(self, key: str, call: _Call, result: Any = None, error: Optional[BaseException] = None):
+        """
+        Publish the leader's outcome and release its followers
+        
+        Args:
+            key: Identity of the call
+            call: Call returned by join()
+            result: Result of the call
+            error: Exception raised by the call, if any
+        """
+        call.result = result
+        call.error = error
+        with self._lock:
+            del self._calls[key]
+        call.done.set()
+    
+    @staticmethod
+    def wait(call: _Call) -> Any:
+        """
+        Wait for a followed call to finish
+        
+        Args:
+            call: Call returned by join()
+            
+        Returns:
+            Any: Result of the call (its exception is re-raised)
+        """
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+    
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Execute fn once for all concurrent callers of key
+        
+        Args:
+            key: Identity of the call
+            fn: Function to execute
+            
+        Returns:
+            Any: Result of fn
+        """
+        call, leader = self.join(key)
+        if not leader:
+            return self.wait(call)
+        
+        try:
+            result = fn()
+        except BaseException as e:
+            self.finish(key, call, error=e)
+            raise
+        self.finish(key, call, result)
+        return result
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get coalescing counters
+        
+        Returns:
+            Dict: In-flight, executed and coalesced call counts
+        """
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'executed': self.executed,
+                'coalesced': self.coalesced
+            }
\ No newline at end of file
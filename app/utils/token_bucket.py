@@ -0,0 +1,86 @@
+"""
+In-process token-bucket rate limiter
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+class TokenBucketLimiter:
+    """
+    Token bucket per client, refilled continuously
+    
+    Each client may burst up to `capacity` requests and then gets
+    `capacity` requests per `window` seconds. Buckets are kept in
+    least-recently-used order and at most `max_clients` of them exist:
+    a new client evicts the one seen longest ago, whose bucket has most
+    likely refilled anyway. Every operation is O(1) under a short lock,
+    so clients rotating through addresses cannot grow memory or slow
+    down other requests.
+    """
+    
+    def __init__(self, capacity: int, window: float, max_clients: int = 100000):
+        """
+        Initialize the limiter
+        
+        Args:
+            capacity: Bucket size, i.e. requests allowed per window
+            window: Seconds in which an empty bucket refills completely
+            max_clients: Maximum number of buckets kept
+        """
+        self.capacity = float(capacity)
+        self.rate = capacity / window
+        self.max_clients = max_clients
+        self._buckets: 'OrderedDict[str, Tuple[float, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.limited = 0
+        self.evicted = 0
+    
+    def acquire(self, client: str, now: Optional[float] = None) -> float:
+        """
+        Take a token from a client's bucket
+        
+        Args:
+            client: Client identifier
+            now: Current monotonic time (defaults to time.monotonic())
+            
+        Returns:
+            float: 0.0 if the request is allowed, else seconds until a token is available
+        """
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                tokens = self.capacity
+                if len(self._buckets) >= self.max_clients:
+                    self._buckets.popitem(last=False)
+                    self.evicted += 1
+            else:
+                tokens = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+                self._buckets.move_to_end(client)
+            
+            if tokens >= 1.0:
+                self._buckets[client] = (tokens - 1.0, now)
+                self.allowed += 1
+                return 0.0
+            self._buckets[client] = (tokens, now)
+            self.limited += 1
+            return (1.0 - tokens) / self.rate
+    
+    def stats(self) -> Dict[str, float]:
+        """
+        Get limiter counters
+        
+        Returns:
+            Dict: Tracked clients, allowed, limited requests and evicted buckets
+        """
+        with self._lock:
+            return {
+                'clients': len(self._buckets),
+                'allowed': self.allowed,
+                'limited': self.limited,
+                'evicted': self.evicted
+            }
\ No newline at end of file
@@ -0,0 +1,93 @@
+"""
+Canonical cache keys for video and playlist URLs
+"""
+
+from functools import lru_cache
+from typing import NamedTuple, Optional
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+
+# Click identifiers added by ad and social platforms to any URL, along
+# with utm_* parameters; they never change what gets extracted
+TRACKING_PARAMS = {'fbclid', 'gclid', 'dclid', 'msclkid', 'igshid', 'mc_cid', 'mc_eid'}
+
+# YouTube share, referral and start-time parameters: meaningless to
+# YouTube extractors, but they may select content on other sites
+YOUTUBE_PARAMS = {'si', 'feature', 'pp', 'ref', 'ref_src', 't', 'start', 'time_continue'}
+
+# Extractors whose id names a whole channel, whatever tab (videos, shorts,
+# streams, ...) the URL points at; only their playlist URLs are keyed on the id
+CHANNEL_EXTRACTORS = {'YoutubeTab'}
+
+class CanonicalUrl(NamedTuple):
+    """Result of URL normalization"""
+    extractor_key: str
+    id: Optional[str]
+    key: str
+
+def _clean_url(url: str, ignored_params: frozenset = frozenset()) -> str:
+    """
+    Normalize a URL textually: lowercase scheme and host, drop the fragment
+    and tracking parameters, and sort what remains of the query
+    
+    Args:
+        url: URL to clean
+        ignored_params: Site-specific parameters to drop as well
+        
+    Returns:
+        str: Cleaned URL
+    """
+    parsed = urlparse(url.strip())
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if name.lower() not in TRACKING_PARAMS and name.lower() not in ignored_params
+        and not name.lower().startswith('utm_')
+    )
+    return urlunparse((
+        parsed.scheme.lower(),
+        parsed.netloc.lower(),
+        parsed.path or '/',
+        parsed.params,
+        urlencode(query),
+        ''
+    ))
+
+@lru_cache(maxsize=1)
+def _extractor_classes():
+    """Load yt-dlp's extractor classes once, in matching order"""
+    from yt_dlp.extractor import gen_extractor_classes  # Deferred: importing yt-dlp is slow
+    
+    return [ie for ie in gen_extractor_classes() if ie.ie_key() != 'Generic']
+
+@lru_cache(maxsize=16384)
+def normalize_url(url: str) -> CanonicalUrl:
+    """
+    Map a request URL to a canonical cache key without any network I/O
+    
+    The URL is matched against yt-dlp's extractors the same way
+    extraction would, so ``youtu.be/X``, ``m.youtube.com/watch?v=X`` and
+    ``watch?v=X&t=4s`` all become ``Youtube:X``. URLs only the generic
+    extractor would handle, and channel pages, whose id is shared by all
+    of the channel's tabs, are keyed on their cleaned form; YouTube's own
+    share and start-time parameters are only dropped from YouTube URLs.
+    
+    Args:
+        url: Video or playlist URL
+        
+    Returns:
+        CanonicalUrl: Extractor key, media id and cache key
+    """
+    url = url.strip()
+    for ie in _extractor_classes():
+        try:
+            if not ie.suitable(url):
+                continue
+            media_id = ie.get_temp_id(url)
+        except Exception:
+            continue
+        cleaned = _clean_url(url, YOUTUBE_PARAMS if ie.ie_key().startswith('Youtube') else frozenset())
+        if media_id and ie.ie_key() in CHANNEL_EXTRACTORS and 'list' not in dict(parse_qsl(urlparse(url).query)):
+            return CanonicalUrl(ie.ie_key(), str(media_id), f"{ie.ie_key()}:{cleaned}")
+        if media_id:
+            return CanonicalUrl(ie.ie_key(), str(media_id), f"{ie.ie_key()}:{media_id}")
+        return CanonicalUrl(ie.ie_key(), None, f"{ie.ie_key()}:{cleaned}")
+    return CanonicalUrl('Generic', None, f"Generic:{_clean_url(url)}")
\ No newline at end of file
@@ -0,0 +1,161 @@
+"""
+Write-behind batching of database writes
+"""
+
+import atexit
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+_FLUSH = object()
+_STOP = object()
+
+class WriteBehindWriter:
+    """
+    Queue records in memory and write them from a background thread
+    
+    Records are written in batches of up to max_batch, at most max_delay
+    seconds after the first record of a batch was queued. Batches are
+    written in submission order by a single thread, so a later record for
+    the same key never lands before an earlier one. Pending records are
+    written on close(), which runs at interpreter exit.
+    """
+    
+    def __init__(self, write: Callable[[List[Any]], None], max_batch: int, max_delay: float, max_pending: int):
+        """
+        Initialize the writer
+        
+        Args:
+            write: Function writing one batch (in one transaction)
+            max_batch: Maximum records per batch
+            max_delay: Maximum seconds a record waits before its batch is written
+            max_pending: Queue size at which submit() blocks
+        """
+        self._write = write
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: 'queue.Queue[Any]' = queue.Queue(maxsize=max_pending)
+        self._condition = threading.Condition()
+        self._submitted = 0
+        self._processed = 0
+        self.batches = 0
+        self.failed = 0
+        self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+        self._closed = False
+    
+    def start(self):
+        """
+        Start the background writer thread
+        """
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def submit(self, record: Any):
+        """
+        Queue a record for writing
+        
+        Args:
+            record: Record passed to the write function
+        """
+        with self._condition:
+            self._submitted += 1
+        self._queue.put(record)
+    
+    def flush(self, timeout: float = 10.0) -> bool:
+        """
+        Block until everything submitted so far has been written
+        
+        Args:
+            timeout: Maximum seconds to wait
+            
+        Returns:
+            bool: True if all records were processed in time
+        """
+        with self._condition:
+            target = self._submitted
+            if self._processed >= target:
+                return True
+        self._queue.put(_FLUSH)
+        with self._condition:
+            return self._condition.wait_for(lambda: self._processed >= target, timeout)
+    
+    def close(self, timeout: float = 10.0):
+        """
+        Write pending records and stop the writer thread
+        
+        Args:
+            timeout: Maximum seconds to wait for pending writes
+        """
+        if self._closed or not self._thread.is_alive():
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+    
+    def _run(self):
+        """Writer thread loop"""
+        stopping = False
+        while not stopping:
+            record = self._queue.get()
+            if record is _STOP:
+                break
+            batch = [] if record is _FLUSH else [record]
+            
+            deadline = time.monotonic() + self.max_delay
+            while record is not _FLUSH and len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    record = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if record is _STOP:
+                    stopping = True
+                    break
+                if record is not _FLUSH:
+                    batch.append(record)
+            
+            if stopping:
+                # Drain whatever was queued before the stop request
+                while True:
+                    try:
+                        record = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if record is not _FLUSH and record is not _STOP:
+                        batch.append(record)
+            
+            if batch:
+                self._write_batch(batch)
+    
+    def _write_batch(self, batch: List[Any]):
+        """Write one batch and update the counters"""
+        for start in range(0, len(batch), self.max_batch):
+            chunk = batch[start:start + self.max_batch]
+            try:
+                self._write(chunk)
+                failed = 0
+            except Exception:
+                failed = len(chunk)
+            with self._condition:
+                self.batches += 1
+                self.failed += failed
+                self._processed += len(chunk)
+                self._condition.notify_all()
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get writer counters
+        
+        Returns:
+            Dict: Pending, written and failed record counts
+        """
+        with self._condition:
+            return {
+                'pending': self._submitted - self._processed,
+                'written': self._processed - self.failed,
+                'failed': self.failed,
+                'batches': self.batches
+            }
\ No newline at end of file
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cached-request throughput of the dev server vs gunicorn
+
+Runs offline. Seeds a temporary database with a cached result, starts
+each server on a local port and sends POST /api/v1/get-download-links
+for the cached URL from concurrent keep-alive clients.
+
+Usage:
+    python benchmarks/bench_serving.py [requests] [concurrency] [gunicorn workers]
+"""
+
+import http.client
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+URL = 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
+PORT = 5055
+
+def seed(database_url):
+    """Store a canonical result for URL, as a previous extraction would"""
+    os.environ['DATABASE_URL'] = database_url
+    from app import create_app
+    from app.db import add_request_log
+    from app.utils.url_normalizer import normalize_url
+    
+    app = create_app(start_services=False)
+    formats = [
+        {
+            'format_id': str(i), 'format_note': f'{h}p', 'ext': 'mp4', 'resolution': f'{h * 16 // 9}x{h}',
+            'fps': 30, 'vcodec': 'avc1', 'acodec': 'mp4a', 'filesize': 1000000 * i, 'filesize_approx': None,
+            'url': f'https://example.com/{i}?expire=4102444800', 'tbr': i * 100.0, 'vbr': None, 'abr': None,
+            'protocol': 'https', 'filesize_formatted': f'{i}.0 MB'
+        }
+        for i, h in enumerate([144, 240, 360, 480, 720, 1080] * 4, start=1)
+    ]
+    result = {
+        'success': True,
+        'is_playlist': False,
+        'video': {
+            'id': 'dQw4w9WgXcQ', 'title': 'Benchmark video', 'duration': 213, 'duration_formatted': '03:33',
+            'description': 'x' * 2000, 'extractor': 'youtube', 'extractor_key': 'Youtube',
+            'thumbnails': [], 'subtitles': {}, 'formats': formats
+        }
+    }
+    with app.app_context():
+        add_request_log(normalize_url(URL).key, 'canonical', result, 1.0)
+
+def wait_ready(process):
+    """Wait until the server answers /health"""
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError('Server exited during startup')
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', PORT, timeout=1)
+            connection.request('GET', '/health')
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('Server did not start')
+
+def load(requests, concurrency):
+    """Send requests from keep-alive clients and return requests per second"""
+    body = json.dumps({'url': URL, 'format': '720p'})
+    headers = {'Content-Type': 'application/json'}
+    
+    def client(count):
+        connection = http.client.HTTPConnection('127.0.0.1', PORT)
+        for _ in range(count):
+            connection.request('POST', '/api/v1/get-download-links', body, headers)
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                raise RuntimeError(f'Unexpected status {response.status}')
+            if response.getheader('Connection', '').lower() == 'close':
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', PORT)
+        connection.close()
+    
+    client(10)  # Warm the response cache
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        list(executor.map(client, [requests // concurrency] * concurrency))
+    return (requests // concurrency * concurrency) / (time.perf_counter() - start)
+
+def bench(command, env, requests, concurrency):
+    """Start a server, measure it and stop it"""
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_ready(process)
+        return load(requests, concurrency)
+    finally:
+        process.terminate()
+        process.wait(30)
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else (os.cpu_count() or 1) * 2 + 1
+    
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        seed(database_url)
+        env = {**os.environ, 'DATABASE_URL': database_url, 'JOB_WORKERS': '0', 'LOG_LEVEL': 'WARNING',
+               'LOG_FILE': os.path.join(directory, 'bench.log')}
+        
+        dev = bench([sys.executable, '-c', f"from main import create_app; create_app().run(port={PORT}, threaded=True)"],
+                    env, requests, concurrency)
+        prod = bench([sys.executable, '-m', 'gunicorn', '-w', str(workers), '-b', f'127.0.0.1:{PORT}', 'wsgi:app'],
+                     env, requests, concurrency)
+    
+    print(f"{requests} cached requests, {concurrency} clients, {os.cpu_count()} CPUs")
+    print(f"Flask dev server (threaded):  {dev:8.0f} req/s")
+    print(f"gunicorn ({workers} workers):      {prod:8.0f} req/s")
\ No newline at end of file
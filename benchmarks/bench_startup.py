@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold start time against a startup budget
+
+Runs offline. Each run uses a fresh interpreter and measures importing
+the app package, building the app with create_app, and then the work
+deferred to warm() (importing yt-dlp, compiling extractor patterns,
+building yt-dlp instances). Exits with status 1 if the median startup
+time (import + create_app) is over budget, or if yt-dlp got imported
+before the first extraction.
+
+Usage:
+    python benchmarks/bench_startup.py [runs] [budget ms]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+from app.config import Config
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    JOB_WORKERS = 0
+    WARM_ON_START = False
+application = app.create_app(BenchConfig)
+created = time.perf_counter()
+eager = 'yt_dlp' in sys.modules
+from app.routes.video_routes import video_service
+video_service.warm()
+warmed = time.perf_counter()
+print(json.dumps({
+    'import': (imported - start) * 1000,
+    'create_app': (created - imported) * 1000,
+    'warm': (warmed - created) * 1000,
+    'eager_yt_dlp': eager
+}))
+"""
+
+def run_once():
+    """Measure one cold start in a fresh interpreter"""
+    env = {**os.environ, 'LOG_LEVEL': 'WARNING'}
+    output = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, env=env, capture_output=True,
+                            text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else 1500.0
+    
+    results = [run_once() for _ in range(runs)]
+    medians = {key: statistics.median(result[key] for result in results) for key in ('import', 'create_app', 'warm')}
+    startup = medians['import'] + medians['create_app']
+    eager = any(result['eager_yt_dlp'] for result in results)
+    
+    print(f"Median of {runs} cold starts:")
+    print(f"  import app:        {medians['import']:8.1f} ms")
+    print(f"  create_app():      {medians['create_app']:8.1f} ms")
+    print(f"  startup total:     {startup:8.1f} ms (budget {budget:.0f} ms)")
+    print(f"  deferred warm():   {medians['warm']:8.1f} ms")
+    if eager:
+        print("yt-dlp was imported during startup")
+    sys.exit(1 if eager or startup > budget else 0)
\ No newline at end of file
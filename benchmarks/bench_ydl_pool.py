@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: per-extraction overhead of a fresh YoutubeDL vs the pool
+
+Runs offline. Each iteration does the setup work an extraction pays
+before any network I/O: building (or borrowing) a YoutubeDL with the
+service's options and instantiating the YouTube extractor.
+
+Usage:
+    python benchmarks/bench_ydl_pool.py [iterations]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import yt_dlp
+from app.services.video_service import VideoService
+
+def bench_fresh(options, iterations):
+    """Time a new YoutubeDL per extraction, as before the pool existed"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        with yt_dlp.YoutubeDL(options) as ydl:
+            ydl.get_info_extractor('Youtube')
+    return (time.perf_counter() - start) / iterations
+
+def bench_pooled(service, options, iterations):
+    """Time a pool checkout per extraction"""
+    with service.ydl_pool.checkout(options) as ydl:
+        ydl.get_info_extractor('Youtube')
+    start = time.perf_counter()
+    for _ in range(iterations):
+        with service.ydl_pool.checkout(options) as ydl:
+            ydl.get_info_extractor('Youtube')
+    return (time.perf_counter() - start) / iterations
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    service = VideoService()
+    options = service._get_yt_dlp_options('best')
+    
+    # Warm imports and regex caches so both sides are measured steady-state
+    bench_fresh(options, 3)
+    
+    fresh = bench_fresh(options, iterations)
+    pooled = bench_pooled(service, options, iterations)
+    
+    print(f"Iterations:           {iterations}")
+    print(f"Fresh YoutubeDL:      {fresh * 1000:.3f} ms/extraction")
+    print(f"Pooled YoutubeDL:     {pooled * 1000:.3f} ms/extraction")
+    print(f"Saved per extraction: {(fresh - pooled) * 1000:.3f} ms ({fresh / pooled:.0f}x)")
+    print(f"Pool stats:           {service.ydl_pool.stats()}")
\ No newline at end of file
@@ -0,0 +1,47 @@
+"""
+Gunicorn configuration for the production server
+
+Usage:
+    gunicorn wsgi:app
+
+(gunicorn reads ./gunicorn.conf.py automatically.) The app is loaded and
+warmed in the master before forking; each worker then starts its own
+background threads and drops database connections inherited from the
+master. Workers share the database cache tier, and identical extractions
+are coalesced across workers with a lock row.
+"""
+
+import multiprocessing
+import os
+
+# Coalesce identical extractions across workers through the shared database
+os.environ.setdefault('SINGLE_FLIGHT_DISTRIBUTED', 'true')
+
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('WEB_CONCURRENCY', str(multiprocessing.cpu_count() * 2 + 1)))
+worker_class = 'gthread'
+threads = int(os.environ.get('WORKER_THREADS', '8'))  # Requests mostly wait on extraction I/O
+preload_app = True
+timeout = int(os.environ.get('WORKER_TIMEOUT', '120'))
+graceful_timeout = int(os.environ.get('GRACEFUL_TIMEOUT', '30'))
+keepalive = 5
+max_requests = int(os.environ.get('MAX_REQUESTS', '0'))  # Recycle workers after this many requests (0 = never)
+max_requests_jitter = int(os.environ.get('MAX_REQUESTS_JITTER', '0'))
+accesslog = os.environ.get('ACCESS_LOG')  # e.g. '-' for stdout
+
+def post_worker_init(worker):
+    """Start per-worker background threads once the worker is set up"""
+    from app import start_background_services
+    from app.db import db
+    
+    app = worker.wsgi
+    with app.app_context():
+        # Connections opened by the master must not be shared with it
+        db.engine.dispose(close=False)
+    start_background_services(app)
+
+def worker_exit(server, worker):
+    """Finish job items and flush cache writes before the worker exits"""
+    from app import stop_background_services
+    
+    stop_background_services(timeout=max(1, graceful_timeout - 5))
\ No newline at end of file
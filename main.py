@@ -4,7 +4,6 @@ Main application entry point for Video Download API
 """
 
 from app import create_app
-from app.db import db
 from app.utils.logger import setup_logger
 
 # Set up logger
@@ -16,10 +15,6 @@ def main():
     """
     app = create_app()
     
-    # Create database tables
-    with app.app_context():
-        db.create_all()
-    
     logger.info("Starting Video Download API...")
     logger.info("API Documentation: http://127.0.0.1:5000/")
     logger.info("Health Check: http://127.0.0.1:5000/health")
@@ -225,6 +225,51 @@ def test_get_thumbnails(url):
         print(f"❌ Thumbnails error: {e}")
         return False
 
+def test_stream_video_info(url):
+    """Test streamed (NDJSON) video information extraction"""
+    print(f"\n🌊 Testing streamed video information extraction...")
+    print(f"URL: {url}")
+    
+    try:
+        data = {
+            "url": url
+        }
+        
+        start_time = time.time()
+        response = requests.post(
+            f"{BASE_URL}/api/v1/get-info",
+            json=data,
+            headers={"Content-Type": "application/json", "Accept": "application/x-ndjson"},
+            stream=True
+        )
+        
+        if response.status_code != 200:
+            print(f"❌ Request failed: {response.status_code}")
+            return False
+        
+        first_line_time = None
+        videos = 0
+        for line in response.iter_lines():
+            if not line:
+                continue
+            if first_line_time is None:
+                first_line_time = time.time() - start_time
+            event = json.loads(line)
+            if event['type'] == 'video':
+                videos += 1
+            elif event['type'] == 'end':
+                if not event['success']:
+                    print(f"❌ Streamed extraction failed: {event.get('error', 'Unknown error')}")
+                    return False
+        
+        duration = time.time() - start_time
+        print(f"✅ Streamed {videos} videos in {duration:.2f} seconds (first line after {first_line_time:.2f}s)")
+        return True
+    
+    except Exception as e:
+        print(f"❌ Streamed video info error: {e}")
+        return False
+
 if __name__ == "__main__":
     print("Starting API tests...")
     test_health_check()
@@ -235,4 +280,5 @@ if __name__ == "__main__":
         test_get_video_info(url)
         test_get_subtitles(url)
         test_get_thumbnails(url)
+        test_stream_video_info(url)
     print("Tests completed.")
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""
+Regression tests for the process-pool extraction backend
+"""
+
+import multiprocessing
+import time
+
+import pytest
+
+from app.services import process_backend
+from app.services.process_backend import ProcessExtractionBackend, _Worker
+
+def _fake_worker_main(conn, max_jobs, max_rss):
+    """Answer jobs instantly, except 'hang' which stops after its playlist event and 'hog' which grows"""
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        if job[0] == 'hang':
+            conn.send(({'type': 'playlist', 'playlist': {'id': 'pl', 'title': 'Playlist'}}, False))
+            time.sleep(3600)
+        if job[0] == 'hog':
+            hog = bytearray(256 * 1024 * 1024)
+            time.sleep(3600)
+        result = {'success': True, 'is_playlist': False, 'video': {'id': job[0]}}
+        conn.send(({'type': 'end', 'success': True, 'result': result}, False))
+
+@pytest.fixture
+def backend(monkeypatch):
+    """Backend with one forked fake worker"""
+    monkeypatch.setattr(process_backend, '_worker_main', _fake_worker_main)
+    monkeypatch.setattr(ProcessExtractionBackend, 'KILL_GRACE', 0.0)
+    monkeypatch.setattr(ProcessExtractionBackend, 'WATCHDOG_INTERVAL', 0.1)
+    backend = ProcessExtractionBackend(workers=1, max_jobs=100, max_rss_mb=64)
+    backend._context = multiprocessing.get_context('fork')
+    backend._started = True
+    worker = _Worker(backend._context, backend.max_jobs, backend.max_rss)
+    backend._workers.append(worker)
+    backend._idle.put(worker)
+    yield backend
+    backend.close()
+
+def test_worker_killed_after_playlist_event_is_replaced(backend):
+    hung = backend._workers[0]
+    result = backend.get_video_info('hang', deadline=time.time() + 0.5)
+    
+    assert result['partial'] is True
+    assert backend.killed == 1
+    assert hung not in backend._workers
+    assert not hung.process.is_alive()
+    
+    result = backend.get_video_info('next', deadline=time.time() + 5)
+    assert result == {'success': True, 'is_playlist': False, 'video': {'id': 'next'}}
+    assert backend.crashed == 0
+
+def test_worker_growing_past_memory_limit_is_killed(backend):
+    result = backend.get_video_info('hog', deadline=time.time() + 30)
+    
+    assert result['error'] == 'Extraction used too much memory'
+    assert backend.killed == 1
+    assert backend.get_video_info('next', deadline=time.time() + 5)['success'] is True
+
+def test_failed_restart_does_not_shrink_pool_for_good(backend, monkeypatch):
+    real_worker = process_backend._Worker
+    
+    def failing_worker(*args):
+        raise OSError('fork failed')
+    
+    monkeypatch.setattr(process_backend, '_Worker', failing_worker)
+    backend.get_video_info('hang', deadline=time.time() + 0.5)
+    assert backend._workers == []
+    
+    start = time.time()
+    result = backend.get_video_info('next', deadline=time.time() + 5)
+    assert result['error'] == 'No extraction worker available'
+    assert time.time() - start < 1
+    
+    monkeypatch.setattr(process_backend, '_Worker', real_worker)
+    assert backend.get_video_info('next', deadline=time.time() + 5)['success'] is True
+    assert len(backend._workers) == 1
\ No newline at end of file
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Bulk cache warming for Video Download API
+
+Reads a URL file, extracts every URL with bounded parallelism and writes
+the results into the cache database in batches, so the first API request
+for each URL is a cache hit. The file holds one URL per line, or one JSON
+object per line with a "url" and an optional "flat" flag; blank lines and
+lines starting with '#' are ignored.
+
+URLs that already have a fresh cache entry are skipped, so an interrupted
+run resumes where it stopped when started again. With --progress, finished
+URLs are also recorded in a file, which resumes a --refresh run as well.
+Transient failures are never recorded and are retried by the next run.
+
+Usage:
+    python warm_cache.py urls.txt [--concurrency N] [--flat] [--refresh]
+                         [--progress FILE] [--failures FILE]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app import create_app
+from app.config import Config
+from app.db import add_request_logs, get_result_ttl, get_stored_entry
+from app.routes.video_routes import _cache_identity, video_service
+from app.services.video_service import timeout_result
+from app.utils.batch_executor import BatchExecutor
+
+config = Config()
+
+# Seconds between progress lines
+REPORT_INTERVAL = 5.0
+
+def read_urls(path: str, flat: bool) -> Tuple[List[Tuple[str, bool]], List[str]]:
+    """
+    Read the URLs to warm from a plain-text or JSONL file
+    
+    Args:
+        path: URL file
+        flat: Default flat flag of URLs that do not set one
+        
+    Returns:
+        Tuple: ((url, flat) items, descriptions of unreadable lines)
+    """
+    items = []
+    invalid = []
+    with open(path, encoding='utf-8') as urls_file:
+        for number, line in enumerate(urls_file, start=1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if not line.startswith('{'):
+                items.append((line, flat))
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                invalid.append(f"line {number}: invalid JSON")
+                continue
+            url = record.get('url') if isinstance(record, dict) else None
+            item_flat = record.get('flat', flat) if isinstance(record, dict) else flat
+            if not isinstance(url, str) or not url.strip() or not isinstance(item_flat, bool):
+                invalid.append(f"line {number}: expected a \"url\" string and an optional boolean \"flat\"")
+                continue
+            items.append((url.strip(), item_flat))
+    return items, invalid
+
+def read_progress(path: Optional[str]) -> Set[Tuple[str, str]]:
+    """
+    Read the cache identities finished by previous runs
+    
+    Args:
+        path: Progress file, or None
+        
+    Returns:
+        Set: (cache key, cache format) pairs
+    """
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, encoding='utf-8') as progress_file:
+        return {tuple(line.rstrip('\n').split('\t', 1)) for line in progress_file if '\t' in line}
+
+def is_warm(identity: Tuple[str, str]) -> bool:
+    """
+    Check whether a URL has a fresh cache entry that is not a transient failure
+    
+    Args:
+        identity: (cache key, cache format)
+        
+    Returns:
+        bool: True if the URL does not need to be extracted again
+    """
+    entry = get_stored_entry(*identity)
+    if entry is None:
+        return False
+    result = entry[0]
+    return bool(result.get('success')) or not result.get('retryable', False)
+
+def extract(item: Tuple[str, bool]) -> Tuple[Dict[str, Any], float]:
+    """
+    Run the canonical extraction of a URL, as the API does on a miss
+    
+    Args:
+        item: (url, flat)
+        
+    Returns:
+        Tuple: (result, duration in seconds)
+    """
+    url, flat = item
+    start_time = time.time()
+    result = video_service.get_video_info(url, None, enable_subtitles=True, flat_playlist=flat)
+    return result, time.time() - start_time
+
+class CacheWarmer:
+    """
+    Extract URLs in parallel and store their results in batches
+    
+    Results are buffered and written with add_request_logs, one
+    transaction per batch, from the calling thread only.
+    """
+    
+    def __init__(self, concurrency: int, batch_size: int, progress_path: Optional[str] = None):
+        """
+        Initialize the warmer
+        
+        Args:
+            concurrency: Maximum number of extractions in flight
+            batch_size: Results per database transaction
+            progress_path: File recording finished URLs, or None
+        """
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.progress_path = progress_path
+        self.executor = BatchExecutor(concurrency)
+        self._pending: List[Tuple[str, str, Dict[str, Any], float]] = []
+        self._last_flush = time.monotonic()
+        self.succeeded = 0
+        self.failed: List[Dict[str, Any]] = []
+        self.extraction_time = 0.0
+    
+    def _record(self, identity: Tuple[str, str], url: str, result: Dict[str, Any], duration: float):
+        """Buffer one result for the next batch write; uncacheable results (rejections) are only reported"""
+        if get_result_ttl(result) > 0:
+            self._pending.append((identity[0], identity[1], result, duration))
+        self.extraction_time += duration
+        if result.get('success'):
+            self.succeeded += 1
+        else:
+            self.failed.append({
+                'url': url,
+                'error': result.get('error', 'Unknown error'),
+                'message': result.get('message'),
+                'retryable': result.get('retryable', False)
+            })
+        if (len(self._pending) >= self.batch_size
+                or time.monotonic() - self._last_flush >= config.WRITE_BEHIND_MAX_DELAY):
+            self.flush()
+    
+    def flush(self):
+        """Write buffered results in one transaction and record them as finished"""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        records, self._pending = self._pending, []
+        add_request_logs(records)
+        if self.progress_path:
+            with open(self.progress_path, 'a', encoding='utf-8') as progress_file:
+                for key, format, result, _ in records:
+                    if result.get('success') or not result.get('retryable', False):
+                        progress_file.write(f"{key}\t{format}\n")
+    
+    def run(self, items: List[Tuple[Tuple[str, bool], Tuple[str, str]]]):
+        """
+        Extract and store every item, reporting progress periodically
+        
+        Args:
+            items: ((url, flat), (cache key, cache format)) pairs
+        """
+        timeout = config.BATCH_URL_TIMEOUT
+        
+        def on_timeout(item):
+            return timeout_result(), timeout
+        
+        def on_error(item, error):
+            return {
+                'success': False,
+                'error': 'An unexpected error occurred',
+                'message': str(error),
+                'retryable': True
+            }, 0.0
+        
+        start_time = time.monotonic()
+        next_report = start_time + REPORT_INTERVAL
+        done = 0
+        try:
+            for index, (result, duration) in self.executor.iter_completed(
+                    extract, [item for item, _ in items], self.concurrency, timeout, on_timeout, on_error):
+                (url, _), identity = items[index]
+                self._record(identity, url, result, duration)
+                done += 1
+                if time.monotonic() >= next_report:
+                    next_report += REPORT_INTERVAL
+                    elapsed = time.monotonic() - start_time
+                    print(f"[{done}/{len(items)}] {self.succeeded} ok, {len(self.failed)} failed, "
+                          f"{done / elapsed:.1f} URLs/s", flush=True)
+        finally:
+            self.flush()
+
+def print_report(warmer: CacheWarmer, skipped: int, elapsed: float, failures_path: Optional[str]):
+    """
+    Print throughput and a summary of failures grouped by error
+    
+    Args:
+        warmer: Finished or interrupted warmer
+        skipped: URLs skipped because they were already cached or finished
+        elapsed: Wall-clock seconds spent extracting
+        failures_path: File to write every failure to as JSONL, or None
+    """
+    processed = warmer.succeeded + len(warmer.failed)
+    print(f"\nProcessed {processed} URLs in {elapsed:.1f}s "
+          f"({processed / elapsed if elapsed else 0.0:.2f} URLs/s, concurrency {warmer.concurrency})")
+    print(f"  succeeded: {warmer.succeeded}")
+    print(f"  failed:    {len(warmer.failed)} "
+          f"({sum(1 for failure in warmer.failed if failure['retryable'])} retryable)")
+    print(f"  skipped:   {skipped}")
+    if processed:
+        print(f"  mean extraction time: {warmer.extraction_time / processed:.2f}s")
+    
+    if warmer.failed:
+        print("\nFailures:")
+        errors = Counter(failure['error'] for failure in warmer.failed)
+        for error, count in errors.most_common():
+            print(f"  {count:>6}  {error}")
+            for failure in [failure for failure in warmer.failed if failure['error'] == error][:3]:
+                print(f"          {failure['url']}")
+    
+    if failures_path and warmer.failed:
+        with open(failures_path, 'w', encoding='utf-8') as failures_file:
+            for failure in warmer.failed:
+                failures_file.write(json.dumps(failure) + '\n')
+        print(f"\nWrote {len(warmer.failed)} failures to {failures_path}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Warm the cache from a URL file
+    
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+        
+    Returns:
+        int: Exit status; 1 if any URL failed, 130 if interrupted
+    """
+    parser = argparse.ArgumentParser(description='Preload the cache with the results of a list of URLs')
+    parser.add_argument('urls', help='URL file: one URL or one JSON object with a "url" per line')
+    parser.add_argument('--concurrency', type=int, default=config.BATCH_MAX_CONCURRENCY,
+                        help='Extractions in flight (default: BATCH_MAX_CONCURRENCY)')
+    parser.add_argument('--batch-size', type=int, default=config.WRITE_BEHIND_BATCH_SIZE,
+                        help='Results per database transaction (default: WRITE_BEHIND_BATCH_SIZE)')
+    parser.add_argument('--flat', action='store_true', help='Warm unresolved playlist results by default')
+    parser.add_argument('--refresh', action='store_true', help='Re-extract URLs that are already cached')
+    parser.add_argument('--progress', help='File recording finished URLs, used to resume interrupted runs')
+    parser.add_argument('--failures', help='Write every failure to this file as JSONL')
+    parser.add_argument('--verbose', action='store_true', help='Show the application log')
+    args = parser.parse_args(argv)
+    if args.concurrency < 1 or args.batch_size < 1:
+        parser.error('--concurrency and --batch-size must be positive')
+    
+    if not args.verbose:
+        logging.disable(logging.INFO)
+    
+    items, invalid = read_urls(args.urls, args.flat)
+    for problem in invalid:
+        print(f"Skipping {problem}", file=sys.stderr)
+    
+    app = create_app(start_services=False)
+    with app.app_context():
+        finished = read_progress(args.progress)
+        todo = []
+        seen = set()
+        for item in items:
+            identity = _cache_identity(*item)
+            if identity in seen:
+                continue
+            seen.add(identity)
+            if identity in finished or (not args.refresh and is_warm(identity)):
+                continue
+            todo.append((item, identity))
+        skipped = len(seen) - len(todo)
+        print(f"Warming {len(todo)} URLs ({skipped} already warm, "
+              f"{len(items) - len(seen)} duplicates, {len(invalid)} invalid lines)", flush=True)
+        
+        video_service.warm()
+        warmer = CacheWarmer(args.concurrency, args.batch_size, args.progress)
+        start_time = time.monotonic()
+        interrupted = False
+        try:
+            warmer.run(todo)
+        except KeyboardInterrupt:
+            interrupted = True
+            print("\nInterrupted; finished results were saved, run again to resume", file=sys.stderr)
+        print_report(warmer, skipped, time.monotonic() - start_time, args.failures)
+    
+    if interrupted:
+        return 130
+    return 1 if warmer.failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
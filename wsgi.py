@@ -0,0 +1,15 @@
+"""
+WSGI entry point for production servers
+
+Imports the application and warms the extraction stack at import time, so
+a pre-forking server (see gunicorn.conf.py) pays for it once in the master
+and every worker starts warm. Background threads are started per worker.
+"""
+
+import os
+from app import create_app
+from app.config import config
+from app.routes.video_routes import video_service
+
+app = create_app(config[os.environ.get('APP_ENV', 'production')], start_services=False)
+video_service.warm()
\ No newline at end of file